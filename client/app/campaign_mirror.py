@@ -0,0 +1,71 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+MIRROR_SYNC_INTERVAL = int(os.environ.get("MIRROR_SYNC_INTERVAL", 10))
+
+
+# Local copy of the campaign list of the server, kept in an SQLite file.
+# It follows the change feed of the server (/api/campaign/changes) so every sync
+# downloads only the campaigns that changed since the last one, and the list can
+# still be served while the server is down.
+class CampaignMirror(threading.Thread):
+    def __init__(self, path, fetch_changes, interval=MIRROR_SYNC_INTERVAL) -> None:
+        # fetch_changes(since) returns the json response of the change feed
+        super().__init__(daemon=True)
+        self.fetch_changes = fetch_changes
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.sync_lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS campaigns (address TEXT PRIMARY KEY, change_seq INTEGER NOT NULL, campaign TEXT NOT NULL)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def last_seq(self):
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'last_seq'").fetchone()
+        return None if row is None else int(row[0])
+
+    def synced(self):
+        # True once the mirror has completed a sync with the server
+        return self.last_seq() is not None
+
+    def _apply(self, changes, last_seq):
+        with self.lock:
+            with self.conn:
+                self.conn.execute("BEGIN")
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO campaigns (address, change_seq, campaign) VALUES (?, ?, ?)",
+                    [(i["address"], i.pop("change_seq"), json.dumps(i)) for i in changes]
+                )
+                self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_seq', ?)", (str(last_seq),))
+
+    def sync(self):
+        # pulls all the changes since the last sync, returns how many campaigns changed
+        with self.sync_lock:
+            since = self.last_seq() or 0
+            count = 0
+            while True:
+                res = json.loads(self.fetch_changes(since))
+                self._apply(res["changes"], res["last_seq"])
+                count += len(res["changes"])
+                since = res["last_seq"]
+                if not res["more"]:
+                    return count
+
+    def list(self):
+        with self.lock:
+            return [json.loads(i[0]) for i in self.conn.execute("SELECT campaign FROM campaigns ORDER BY change_seq")]
+
+    def run(self):
+        while True:
+            try:
+                count = self.sync()
+                if count > 0:
+                    print("Campaign mirror synced {} changes".format(count), flush=True)
+            except Exception as e:
+                print("Campaign mirror sync failed: {}".format(e), flush=True)
+            time.sleep(self.interval)
@@ -1,250 +1,713 @@
-from datetime import datetime, timedelta
-
-from flask.json.tag import TagTuple
-from web3 import Web3
-from web3.middleware import geth_poa_middleware
-from solc import compile_standard
-import json, os
-from eth_account.messages import encode_defunct
-from server_utilities import new_fund, end_fund
-w3 = Web3(Web3.HTTPProvider(os.environ.get("ETH_HOST")))
-w3.middleware_onion.inject(geth_poa_middleware, layer=0)
-
-MIN_CONTRACT_TIME = 0 # in days
-MAX_CONTRACT_TIME = 36500 # in days
-
-
-class ClientContractManager:
-    def __init__(self) -> None:
-        comp = {
-            "language": "Solidity",
-            "sources": {
-                "fundraiser.sol": {
-                    "content":
-                        open("app/contracts/fundraiser.sol", "r").read()
-                },
-            },
-            "settings": {
-                "outputSelection": { "*": { "*": [ "*" ], "": [ "*" ] } }
-            }
-        }
-        compiled_sol = compile_standard(comp)
-        self.bytecode = compiled_sol['contracts']['fundraiser.sol']['Fundraiser']['evm']['bytecode']['object']
-        self.abi = json.loads(compiled_sol['contracts']['fundraiser.sol']['Fundraiser']['metadata'])['output']['abi']
-
-
-    def createNewFundContract(self, account_add, owner1, owner2, owner3, goal, name, description, expires, wallet):
-        if expires - datetime.now() < timedelta(days = MIN_CONTRACT_TIME):
-            return {
-                "result": "fail",
-                "reason": "Contract expiry too short - need {} days minimum".format(MIN_CONTRACT_TIME)
-            }
-        if expires - datetime.now() > timedelta(days = MAX_CONTRACT_TIME):
-            return {
-                "result": "fail",
-                "reason": "Contract expiry too long - need {} days maximum".format(MAX_CONTRACT_TIME)
-            }
-        if not wallet.is_unlocked(account_add):
-            return {
-                "result": "fail",
-                "reason": "Creating account is not known or it's locked - Try unlocking with password first"
-            }
-
-        
-        timelimit_seconds = int((expires - datetime.now()).total_seconds())
-        
-        account = wallet.create_w3_account(account_add)
-        
-        w3.eth.default_account = account.address
-        
-        Fundraiser = w3.eth.contract(abi=self.abi, bytecode=self.bytecode)
-        transaction = Fundraiser.constructor(owner1, owner2, owner3, goal, timelimit_seconds).buildTransaction({'nonce': w3.eth.get_transaction_count(account_add)})
-        signed_txn = wallet.signTransaction(account_add, transaction)
-
-        try:
-            tx_hash = w3.eth.sendRawTransaction(signed_txn.rawTransaction)
-        except Exception as e:
-            return {
-                "result": "fail",
-                "reason": str(e)
-            }
-        
-        tx_receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
-
-        contract_address = tx_receipt["contractAddress"]
-
-        try:
-            new_fund(contract_address, owner1, owner2, owner3, name, description)
-        except Exception as e:
-            print("Failed to contact manager")
-            return {
-                "result": "success",
-                "fund_address": contract_address
-            }
-
-        return {
-            "result": "success",
-            "fund_address": contract_address
-        }
-
-    def fund_campaign(self, contract_address, amount, account_add, wallet):
-        Fundraiser = w3.eth.contract(
-            address=contract_address,
-            abi=self.abi
-        )
-        account = wallet.create_w3_account(account_add)
-        if account == "Unknown Account":
-            return {
-                "result": "fail",
-                "reason": "Account is unknown or locked. Try unlocking first"
-            }
-        w3.eth.default_account = account.address
-
-        try:
-            transaction = Fundraiser.functions.fund(amount).buildTransaction({'nonce': w3.eth.get_transaction_count(account_add), 'value': amount})
-        except Exception as e:
-            return {
-                "result": "fail",
-                "reason": str(e)
-            }
-        signed_txn = wallet.signTransaction(account_add, transaction)
-
-        try:
-            tx_hash = w3.eth.sendRawTransaction(signed_txn.rawTransaction)
-        except Exception as e:
-            return {
-                "result": "fail",
-                "reason": str(e)
-            }
-
-        tx_receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
-
-        return {
-            "result": "success",
-            "reason": "Successfully funded fund: {} with {} wei".format(contract_address, amount)
-        }
-
-    def refund(self, contract_address, account_add, wallet):
-        Fundraiser = w3.eth.contract(
-            address=contract_address,
-            abi=self.abi
-        )
-        account = wallet.create_w3_account(account_add)
-        if account == "Unknown Account":
-            return {
-                "result": "fail",
-                "reason": "Account is unknown or locked. Try unlocking first"
-            }
-        w3.eth.default_account = account.address
-
-        try:
-            transaction = Fundraiser.functions.refund().buildTransaction({'nonce': w3.eth.get_transaction_count(account_add)})
-        except Exception as e:
-            return {
-                "result": "fail",
-                "reason": str(e)
-            }
-        signed_txn = wallet.signTransaction(account_add, transaction)
-
-        try:
-            tx_hash = w3.eth.sendRawTransaction(signed_txn.rawTransaction)
-        except Exception as e:
-            return {
-                "result": "fail",
-                "reason": str(e)
-            }
-        
-
-        tx_receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
-
-        return {
-            "result": "success",
-            "reason": "Successfully refunded account: {}".format(account)
-        }
-
-    def get_fund_status(self, contract_address):
-        Fundraiser = w3.eth.contract(
-            address=contract_address,
-            abi=self.abi
-        )
-        bal, funds_withdrawn, expires, goal = Fundraiser.functions.getStatus().call()
-        return {
-            "balance": bal,
-            "expired": datetime.now() > datetime.fromtimestamp(expires),
-            "expires": datetime.fromtimestamp(expires).strftime("%Y/%m/%d, %H:%M:%S"),
-            "goal_reached": funds_withdrawn or goal < bal, 
-            "goal": goal,
-            "funds_withdrawn": funds_withdrawn
-        }
-
-    def separate_sig(self, signature):
-        #r, s, v
-        signature = signature.replace('0x', "")
-        return '0x' + signature[0:64], '0x' + signature[64:128], int(signature[128:], 16)
-
-    def withdraw(self, contract_address, dest_account, account_add, second_signature, wallet):
-        Fundraiser = w3.eth.contract(
-            address=contract_address,
-            abi=self.abi
-        )
-        
-        account = wallet.create_w3_account(account_add)
-        if account == "Unknown Account":
-            return {
-                "result": "fail",
-                "reason": "Account is unknown or locked. Try unlocking first"
-            }
-        w3.eth.default_account = account.address
-        balance, funds_withdrawn, expires, goal = Fundraiser.functions.getStatus().call()
-        
-        try:
-            r,s,v = self.separate_sig(second_signature)
-            transaction = Fundraiser.functions.withdraw(dest_account, r, s, v).buildTransaction({'nonce': w3.eth.get_transaction_count(account_add)})
-        except Exception as e:
-            return {
-                "result": "fail",
-                "reason": str(e)
-            }
-        signed_txn = wallet.signTransaction(account_add, transaction)
-
-        try:
-            tx_hash = w3.eth.sendRawTransaction(signed_txn.rawTransaction)
-        except Exception as e:
-            return {
-                "result": "fail",
-                "reason": str(e)
-            }
-
-        tx_receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
-    
-        end_fund(contract_address, balance, dest_account)
-        return {
-                "result": "success",
-                "reason": "Successfully withdrew all funds from fundraiser {} to account {}".format(contract_address, dest_account),
-                "balance": balance,
-                "dest_account": dest_account
-            }
-
-    def to_32byte_hex(self, val):
-        return Web3.toHex(Web3.toBytes(val).rjust(32, b'\0'))
-
-
-    def create_signature(self, contract_address, dest_account, account_add, wallet):
-        message = "{}{}".format(dest_account, contract_address)
-        print("signing message: {} with account: {}".format(message, account_add), flush=True)
-        account = wallet.create_w3_account(account_add)
-        if account == "Unknown Account":
-            return {
-                "result": "fail",
-                "reason": "Account is unknown or locked. Try unlocking first"
-            }
-        w3.eth.default_account = account.address
-
-        message = Web3.soliditySha3(['address', 'address'], [Web3.toChecksumAddress(dest_account), Web3.toChecksumAddress(contract_address)])
-
-        signed_message = account.sign_message(encode_defunct(message))
-
-        return {
-            "result": "success",
-            "signed_message": Web3.toHex(signed_message['signature'])
+from datetime import datetime, timedelta
+from concurrent.futures import TimeoutError
+
+from flask.json.tag import TagTuple
+from web3 import Web3
+from web3.middleware import geth_poa_middleware
+from contract_artifacts import ContractArtifact
+import json, os
+import rlp
+from eth_account.messages import encode_defunct
+from server_utilities import new_fund, end_fund, get_info, ServerRefused
+from rpc_batch import batch_request
+from tx_tracker import TxTracker, TransactionDropped
+from nonce_manager import NonceManager, is_nonce_error
+from outbox import Outbox
+w3 = Web3(Web3.HTTPProvider(os.environ.get("ETH_HOST")))
+w3.middleware_onion.inject(geth_poa_middleware, layer=0)
+
+MIN_CONTRACT_TIME = 0 # in days
+MAX_CONTRACT_TIME = 36500 # in days
+
+# source of the Fundraiser contract that new funds are deployed from. The variants
+# share the interface, so funds of any of them are used the same way
+FUNDRAISER_SOURCE = os.environ.get("FUNDRAISER_SOURCE", "app/contracts/fundraiser.sol")
+FACTORY_SOURCE = "app/contracts/fundraiser_factory.sol"
+# address of a deployed FundraiserFactory. When set new funds are created as
+# minimal proxy clones through the factory instead of deploying the full contract
+FUNDRAISER_FACTORY = os.environ.get("FUNDRAISER_FACTORY") or None
+# selector of Error(string), the revert data of require with a reason string
+REVERT_SELECTOR = "0x08c379a0"
+# next to the wallet by default, the wallet directory is the volume that outlives the container
+OUTBOX_DB = os.environ.get("OUTBOX_DB") or os.path.join(os.path.dirname(os.environ["WALLET_DB"]), "outbox.sqlite")
+
+
+def predict_contract_address(sender, nonce):
+    # address of the contract deployed by sender's transaction with this nonce (CREATE)
+    return Web3.toChecksumAddress(Web3.keccak(rlp.encode([Web3.toBytes(hexstr=sender), nonce]))[12:])
+
+
+class ClientContractManager:
+    def __init__(self) -> None:
+        # abi and bytecode are loaded lazily from the compiled artifact store
+        self.artifact = ContractArtifact(FUNDRAISER_SOURCE, "Fundraiser")
+        self.factory_artifact = ContractArtifact(FACTORY_SOURCE, "FundraiserFactory")
+        self.clone_artifact = ContractArtifact(FACTORY_SOURCE, "FundraiserClone")
+        self.error_names = None
+        self.factory_address = Web3.toChecksumAddress(FUNDRAISER_FACTORY) if FUNDRAISER_FACTORY is not None else None
+        self.nonce_manager = NonceManager(w3)
+        # a dropped transaction leaves a nonce gap, the sender's nonce is read again
+        self.tx_tracker = TxTracker(w3, on_dropped=self.nonce_manager.resync)
+        self.tx_tracker.start()
+        # registrations with the server are delivered in the background
+        self.outbox = Outbox(OUTBOX_DB, {"new_fund": new_fund, "end_fund": end_fund}, refused=(ServerRefused,))
+        self.outbox.start()
+
+    @property
+    def abi(self):
+        return self.artifact.abi
+
+    @property
+    def bytecode(self):
+        return self.artifact.bytecode
+
+
+    def _submitted(self, tx_hash, kind, sender, on_mined=None):
+        # response for transactions sent without waiting, the tracker takes over from here
+        return {
+            "result": "pending",
+            "tx_hash": self.tx_tracker.track(tx_hash, kind, on_mined, sender)
+        }
+
+    def _wait(self, tx_hash, kind, sender, on_mined=None):
+        # Waits for the receipt of a sent transaction, on_mined is run by the tracker so it
+        # also runs when the wait times out. Returns (receipt, None), or (None, response)
+        # when the transaction isn't mined in time - it's still pending - or was dropped
+        tx_hash = self.tx_tracker.track(tx_hash, kind, on_mined, sender)
+        try:
+            return self.tx_tracker.wait_for_receipt(tx_hash, kind), None
+        except TimeoutError:
+            return None, {
+                "result": "pending",
+                "reason": "Transaction is not mined yet, follow it with /api/tx/status",
+                "tx_hash": tx_hash
+            }
+        except TransactionDropped as e:
+            return None, {
+                "result": "fail",
+                "reason": str(e),
+                "tx_hash": tx_hash
+            }
+
+    def get_tx_status(self, tx_hash):
+        return self.tx_tracker.status(tx_hash)
+
+    def latest_block(self):
+        # block number last seen by the receipt watcher, None before its first poll
+        return self.tx_tracker.last_block
+
+    def get_tx_counters(self):
+        counters = self.tx_tracker.get_counters()
+        counters["outbox_pending"] = self.outbox.pending()
+        counters["outbox_failed"] = self.outbox.failed()
+        return counters
+
+    def _send_transaction(self, account_add, build_transaction, wallet):
+        # Builds, signs and sends a transaction with a nonce from the local nonce manager.
+        # A nonce error from the node means the local nonce is stale - resync and try once more
+        for attempt in range(2):
+            nonce = self.nonce_manager.allocate(account_add)
+            try:
+                transaction = build_transaction(nonce)
+                signed_txn = wallet.signTransaction(account_add, transaction)
+            except Exception:
+                self.nonce_manager.release(account_add, nonce)
+                raise
+            try:
+                return w3.eth.sendRawTransaction(signed_txn.rawTransaction)
+            except Exception as e:
+                if not is_nonce_error(e):
+                    self.nonce_manager.release(account_add, nonce)
+                    raise
+                self.nonce_manager.resync(account_add)
+                if attempt > 0:
+                    raise
+
+    def factory(self, factory_address=None):
+        return w3.eth.contract(address=factory_address or self.factory_address, abi=self.factory_artifact.abi)
+
+    def _check_factory(self, factory_address):
+        # Returns why factory_address isn't a FundraiserFactory, None if it looks like one:
+        # it has code and implementation() returns an address that has code too
+        code, implementation = batch_request([
+            ("eth_getCode", [factory_address, "latest"]),
+            ("eth_call", [{"to": factory_address, "data": w3.eth.contract(abi=self.factory_artifact.abi).encodeABI(fn_name="implementation")}, "latest"])
+        ])
+        if isinstance(code, Exception):
+            raise code
+        if code in (None, "0x"):
+            return "No contract at address {}".format(factory_address)
+        if isinstance(implementation, Exception) or implementation is None or len(implementation) != 66:
+            return "Contract at {} is not a FundraiserFactory".format(factory_address)
+        implementation = w3.codec.decode_abi(["address"], Web3.toBytes(hexstr=implementation))[0]
+        if w3.eth.get_code(implementation) in (b"", None):
+            return "Contract at {} is not a FundraiserFactory - its implementation has no code".format(factory_address)
+        return None
+
+    def set_factory(self, factory_address):
+        # None goes back to deploying the full contract for every fund
+        if factory_address is not None:
+            try:
+                reason = self._check_factory(factory_address)
+            except Exception as e:
+                reason = str(e)
+            if reason is not None:
+                return {
+                    "result": "fail",
+                    "reason": reason
+                }
+        self.factory_address = factory_address
+        return {
+            "result": "success",
+            "factory_address": self.factory_address
+        }
+
+    def deploy_factory(self, account_add, wallet):
+        # deploys a FundraiserFactory and creates all following funds through it
+        if not wallet.is_unlocked(account_add):
+            return {
+                "result": "fail",
+                "reason": "Account is unknown or locked. Try unlocking first"
+            }
+        Factory = w3.eth.contract(abi=self.factory_artifact.abi, bytecode=self.factory_artifact.bytecode)
+        try:
+            tx_hash = self._send_transaction(account_add, lambda nonce: Factory.constructor().buildTransaction({'nonce': nonce}), wallet)
+        except Exception as e:
+            return {
+                "result": "fail",
+                "reason": str(e)
+            }
+        tx_receipt, res = self._wait(tx_hash, "deploy_factory", account_add)
+        if res is not None:
+            return res
+        if tx_receipt["status"] != 1:
+            return {
+                "result": "fail",
+                "reason": "Factory deployment reverted"
+            }
+        res = self.set_factory(tx_receipt["contractAddress"])
+        if res["result"] == "success":
+            print("Using fundraiser factory {}".format(self.factory_address), flush=True)
+        return res
+
+    def _created_fund_address(self, tx_receipt, factory_address=None):
+        # None when a factory transaction has no creation event of the factory
+        if tx_receipt["contractAddress"] is not None:
+            return tx_receipt["contractAddress"]
+        # created by the factory, the clone address is in the creation event. Only logs
+        # of the factory itself are read, other contracts could emit the same event
+        logs = [i for i in tx_receipt["logs"] if i["address"].lower() == factory_address.lower()]
+        events = self.factory(factory_address).events.FundraiserCreated().processReceipt(dict(tx_receipt, logs=logs))
+        if len(events) == 0:
+            return None
+        return events[0]["args"]["fundraiser"]
+
+    def _register_fund(self, contract_address, owner1, owner2, owner3, name, description):
+        self.outbox.put("new_fund", address=contract_address, owner1=owner1, owner2=owner2, owner3=owner3, name=name, description=description)
+
+    def createNewFundContract(self, account_add, owner1, owner2, owner3, goal, name, description, expires, wallet, wait=True, use_factory=None):
+        # use_factory None creates through the factory when one is set
+        if expires - datetime.now() < timedelta(days = MIN_CONTRACT_TIME):
+            return {
+                "result": "fail",
+                "reason": "Contract expiry too short - need {} days minimum".format(MIN_CONTRACT_TIME)
+            }
+        if expires - datetime.now() > timedelta(days = MAX_CONTRACT_TIME):
+            return {
+                "result": "fail",
+                "reason": "Contract expiry too long - need {} days maximum".format(MAX_CONTRACT_TIME)
+            }
+        if not wallet.is_unlocked(account_add):
+            return {
+                "result": "fail",
+                "reason": "Creating account is not known or it's locked - Try unlocking with password first"
+            }
+
+        
+        timelimit_seconds = int((expires - datetime.now()).total_seconds())
+        
+        account = wallet.create_w3_account(account_add)
+        
+        w3.eth.default_account = account.address
+        
+        if use_factory is None:
+            use_factory = self.factory_address is not None
+        if use_factory and self.factory_address is None:
+            return {
+                "result": "fail",
+                "reason": "No fundraiser factory is set - deploy one first"
+            }
+
+        factory_address = self.factory_address if use_factory else None
+        nonces = [] # nonce of every built transaction, the last one is the one that was sent
+        if use_factory:
+            build_transaction = lambda nonce: self.factory(factory_address).functions.createFundraiser(owner1, owner2, owner3, goal, timelimit_seconds).buildTransaction({'nonce': nonce})
+        else:
+            Fundraiser = w3.eth.contract(abi=self.abi, bytecode=self.bytecode)
+
+            def build_transaction(nonce):
+                nonces.append(nonce)
+                return Fundraiser.constructor(owner1, owner2, owner3, goal, timelimit_seconds).buildTransaction({'nonce': nonce})
+
+        try:
+            tx_hash = self._send_transaction(account_add, build_transaction, wallet)
+        except Exception as e:
+            return {
+                "result": "fail",
+                "reason": str(e)
+            }
+
+        # A deployed contract's address follows from the sender and nonce, so the fund is
+        # registered with the server right away and the server confirms it once the code
+        # is on the blockchain. Clones get their address from the factory's nonce, which
+        # other creations can take first, so they are registered after mining.
+        predicted_address = None
+        if not use_factory:
+            predicted_address = predict_contract_address(account.address, nonces[-1])
+            self._register_fund(predicted_address, owner1, owner2, owner3, name, description)
+
+        def on_mined(tx_receipt):
+            contract_address = self._created_fund_address(tx_receipt, factory_address)
+            if contract_address is None:
+                print("Transaction {} of factory {} created no fundraiser".format(Web3.toHex(tx_receipt["transactionHash"]), factory_address), flush=True)
+            else:
+                # registered again even at the predicted address: if mining took longer than
+                # the server waits, the early registration was rejected and this puts it back
+                # to pending. A campaign that is already registered is left as is
+                self._register_fund(contract_address, owner1, owner2, owner3, name, description)
+
+        if not wait:
+            res = self._submitted(tx_hash, "create", account_add, on_mined)
+            if predicted_address is not None:
+                res["fund_address"] = predicted_address
+            return res
+
+        tx_receipt, res = self._wait(tx_hash, "create", account_add, on_mined)
+        if res is not None:
+            if res["result"] == "pending" and predicted_address is not None:
+                res["fund_address"] = predicted_address
+            return res
+        if tx_receipt["status"] != 1:
+            return {
+                "result": "fail",
+                "reason": "Fund creation reverted"
+            }
+
+        contract_address = self._created_fund_address(tx_receipt, factory_address)
+        if contract_address is None:
+            return {
+                "result": "fail",
+                "reason": "No fundraiser was created - {} is not a FundraiserFactory".format(factory_address)
+            }
+
+        return {
+            "result": "success",
+            "fund_address": contract_address
+        }
+
+    def fund_campaign(self, contract_address, amount, account_add, wallet, wait=True):
+        Fundraiser = w3.eth.contract(
+            address=contract_address,
+            abi=self.abi
+        )
+        account = wallet.create_w3_account(account_add)
+        if account == "Unknown Account":
+            return {
+                "result": "fail",
+                "reason": "Account is unknown or locked. Try unlocking first"
+            }
+        w3.eth.default_account = account.address
+
+        try:
+            tx_hash = self._send_transaction(account_add, lambda nonce: Fundraiser.functions.fund(amount).buildTransaction({'nonce': nonce, 'value': amount}), wallet)
+        except Exception as e:
+            return {
+                "result": "fail",
+                "reason": str(e)
+            }
+
+        if not wait:
+            return self._submitted(tx_hash, "fund", account_add)
+
+        tx_receipt, res = self._wait(tx_hash, "fund", account_add)
+        if res is not None:
+            return res
+
+        return {
+            "result": "success",
+            "reason": "Successfully funded fund: {} with {} wei".format(contract_address, amount)
+        }
+
+    def fund_campaigns(self, donations, account_add, wallet, wait=True):
+        # Funds many campaigns from one account. All transactions are built and signed up
+        # front with sequential nonces and broadcast in one batch, then all receipts are
+        # awaited together. donations is a list of (contract_address, amount) pairs
+        account = wallet.create_w3_account(account_add)
+        if account == "Unknown Account":
+            return {
+                "result": "fail",
+                "reason": "Account is unknown or locked. Try unlocking first"
+            }
+        w3.eth.default_account = account.address
+
+        results = [{"fund_address": address, "amount": amount} for address, amount in donations]
+        calls = []
+        for result in results:
+            try:
+                Fundraiser = w3.eth.contract(
+                    address=result["fund_address"],
+                    abi=self.abi
+                )
+                calls.append((result, {
+                    "from": account.address,
+                    "to": Fundraiser.address,
+                    "value": result["amount"],
+                    "data": Fundraiser.encodeABI(fn_name="fund", args=[result["amount"]])
+                }))
+            except Exception as e:
+                result["result"] = "fail"
+                result["reason"] = str(e)
+
+        # Every donation is estimated on its own, in one batch. The first donation of an
+        # account to a campaign writes a new deposit and costs more than a repeat one, and
+        # a donation to an expired or invalid campaign fails here instead of being sent
+        try:
+            estimates = batch_request([("eth_estimateGas", [dict(call, value=hex(call["value"]))]) for _, call in calls]) if len(calls) > 0 else []
+        except Exception as e:
+            return {
+                "result": "fail",
+                "reason": str(e)
+            }
+        transactions = []
+        tx_params = {
+            'chainId': w3.eth.chain_id,
+            'gasPrice': w3.eth.gas_price
+        }
+        for (result, call), gas in zip(calls, estimates):
+            if isinstance(gas, Exception):
+                result["result"] = "fail"
+                result["reason"] = str(gas)
+                continue
+            transactions.append((result, dict(tx_params, to=call["to"], value=call["value"], data=call["data"], gas=int(gas, 16))))
+
+        if len(transactions) == 0:
+            return {
+                "result": "fail",
+                "donations": results
+            }
+
+        nonce = self.nonce_manager.allocate(account_add, len(transactions))
+        raw_transactions = []
+        try:
+            for i, (result, transaction) in enumerate(transactions):
+                transaction['nonce'] = nonce + i
+                raw_transactions.append(Web3.toHex(wallet.signTransaction(account_add, transaction).rawTransaction))
+        except Exception as e:
+            self.nonce_manager.resync(account_add) # none of the nonces were used
+            return {
+                "result": "fail",
+                "reason": str(e)
+            }
+
+        try:
+            sent = batch_request([("eth_sendRawTransaction", [i]) for i in raw_transactions])
+        except Exception as e:
+            self.nonce_manager.resync(account_add)
+            return {
+                "result": "fail",
+                "reason": str(e)
+            }
+
+        # A failed send leaves a gap in the nonces. The node keeps the transactions after
+        # it queued and mines them once the account's next transaction fills the gap, so
+        # they are reported as queued - not failed, they'd be paid twice if sent again -
+        # and not awaited
+        gap = None
+        for (result, transaction), tx_hash in zip(transactions, sent):
+            if isinstance(tx_hash, Exception):
+                result["result"] = "fail"
+                result["reason"] = str(tx_hash)
+                if gap is None:
+                    gap = transaction['nonce']
+            elif gap is not None:
+                result["result"] = "queued"
+                result["reason"] = "Sent, but queued behind nonce {} of a transaction that failed to send. It's mined once the account sends its next transaction, don't send it again".format(gap)
+                result["tx_hash"] = self.tx_tracker.track(tx_hash, "fund", sender=account_add)
+            else:
+                result["result"] = "pending"
+                result["tx_hash"] = self.tx_tracker.track(tx_hash, "fund", sender=account_add)
+        if gap is not None:
+            self.nonce_manager.resync(account_add) # unused nonces leave a gap
+
+        if wait:
+            for result in results:
+                if result["result"] != "pending":
+                    continue
+                try:
+                    tx_receipt = self.tx_tracker.wait_for_receipt(result["tx_hash"], "fund")
+                except TimeoutError:
+                    continue # still pending, follow it with the tx_hash
+                except TransactionDropped as e:
+                    result["result"] = "fail"
+                    result["reason"] = str(e)
+                    continue
+                if tx_receipt["status"] == 1:
+                    result["result"] = "success"
+                else:
+                    result["result"] = "fail"
+                    result["reason"] = "Transaction reverted"
+
+        return {
+            "result": "success",
+            "donations": results
+        }
+
+    def refund(self, contract_address, account_add, wallet, wait=True, preflight=True):
+        Fundraiser = w3.eth.contract(
+            address=contract_address,
+            abi=self.abi
+        )
+        account = wallet.create_w3_account(account_add)
+        if account == "Unknown Account":
+            return {
+                "result": "fail",
+                "reason": "Account is unknown or locked. Try unlocking first"
+            }
+        w3.eth.default_account = account.address
+        if preflight:
+            try:
+                res = self._preflight(contract_address, account.address, Fundraiser.encodeABI(fn_name="refund"))
+            except Exception as e:
+                res = {
+                    "result": "fail",
+                    "reason": str(e)
+                }
+            if res is not None:
+                return res
+
+        try:
+            tx_hash = self._send_transaction(account_add, lambda nonce: Fundraiser.functions.refund().buildTransaction({'nonce': nonce}), wallet)
+        except Exception as e:
+            return {
+                "result": "fail",
+                "reason": str(e)
+            }
+        
+        if not wait:
+            return self._submitted(tx_hash, "refund", account_add)
+
+        tx_receipt, res = self._wait(tx_hash, "refund", account_add)
+        if res is not None:
+            return res
+
+        return {
+            "result": "success",
+            "reason": "Successfully refunded account: {}".format(account)
+        }
+
+    def get_fund_status(self, contract_address):
+        Fundraiser = w3.eth.contract(
+            address=contract_address,
+            abi=self.abi
+        )
+        bal, funds_withdrawn, expires, goal = Fundraiser.functions.getStatus().call()
+        return self._format_status(bal, funds_withdrawn, expires, goal)
+
+    def _format_status(self, bal, funds_withdrawn, expires, goal):
+        return {
+            "balance": bal,
+            "expired": datetime.now() > datetime.fromtimestamp(expires),
+            "expires": datetime.fromtimestamp(expires).strftime("%Y/%m/%d, %H:%M:%S"),
+            "goal_reached": funds_withdrawn or goal < bal, 
+            "goal": goal,
+            "funds_withdrawn": funds_withdrawn
+        }
+
+    def get_fund_statuses(self, addresses):
+        # getStatus of many funds in a few batched eth_calls, all read at the same block
+        # so the returned stats are consistent with each other.
+        # Returns a dict of address -> status, None for addresses that aren't live funds
+        block = hex(w3.eth.block_number)
+        data = w3.eth.contract(abi=self.abi).encodeABI(fn_name="getStatus")
+        results = batch_request([("eth_call", [{"to": address, "data": data}, block]) for address in addresses])
+        statuses = dict()
+        for address, result in zip(addresses, results):
+            if isinstance(result, Exception) or result in (None, "0x"):
+                statuses[address] = None # no code at address, e.g. fund was already withdrawn
+                continue
+            bal, funds_withdrawn, expires, goal = w3.codec.decode_abi(["uint256", "bool", "uint256", "uint256"], Web3.toBytes(hexstr=result))
+            statuses[address] = self._format_status(bal, funds_withdrawn, expires, goal)
+        return statuses
+
+    def separate_sig(self, signature):
+        #r, s, v
+        signature = signature.replace('0x', "")
+        return '0x' + signature[0:64], '0x' + signature[64:128], int(signature[128:], 16)
+
+    def _error_names(self):
+        # selector -> name of the custom errors of all fundraiser variants, the packed
+        # and clone variants revert with these instead of a reason string
+        if self.error_names is None:
+            names = dict()
+            for abi in (self.abi, self.clone_artifact.abi):
+                for entry in abi:
+                    if entry["type"] == "error":
+                        signature = "{}({})".format(entry["name"], ",".join(i["type"] for i in entry["inputs"]))
+                        names[Web3.toHex(Web3.keccak(text=signature)[:4])] = entry["name"]
+            self.error_names = names
+        return self.error_names
+
+    def _revert_reason(self, error):
+        data = error.data
+        if isinstance(data, dict):
+            data = data.get("data") # some nodes nest the revert data
+        if not isinstance(data, str) or len(data) < 10:
+            return str(error)
+        if data[:10] == REVERT_SELECTOR:
+            return w3.codec.decode_abi(["string"], Web3.toBytes(hexstr=data[10:]))[0]
+        return self._error_names().get(data[:10], str(error))
+
+    def _preflight(self, contract_address, account_address, data):
+        # Runs the transaction as an eth_call on the pending block before it's signed and
+        # sent. Returns a fail result with the revert reason, None if the call succeeds.
+        # The code is read in the same batch since a call to a withdrawn fund - an address
+        # without code - succeeds without doing anything
+        code, result = batch_request([
+            ("eth_getCode", [contract_address, "pending"]),
+            ("eth_call", [{"from": account_address, "to": contract_address, "data": data}, "pending"])
+        ])
+        if isinstance(code, Exception):
+            raise code
+        if code in (None, "0x"):
+            return {
+                "result": "fail",
+                "reason": "No fundraiser contract at address - it was withdrawn or never created"
+            }
+        if isinstance(result, Exception):
+            return {
+                "result": "fail",
+                "reason": "Transaction would revert: {}".format(self._revert_reason(result))
+            }
+        return None
+
+    def _fund_owners(self, contract_address):
+        # lower case owner addresses of a verified campaign from the server, None if
+        # the server doesn't know the campaign or can't be reached
+        try:
+            info = json.loads(get_info(contract_address))
+        except Exception:
+            return None
+        if info.get("verification") != "verified":
+            return None
+        return set('0x' + info[i].strip().lower() for i in ("owner1", "owner2", "owner3"))
+
+    def _check_second_signature(self, contract_address, dest_account, account_address, second_signature):
+        # Recovers the second signer like the contract does and checks it without a call
+        # to the node. Returns a fail result, None if the signature looks valid
+        message = Web3.soliditySha3(['address', 'address'], [Web3.toChecksumAddress(dest_account), Web3.toChecksumAddress(contract_address)])
+        try:
+            signer = w3.eth.account.recover_message(encode_defunct(message), signature=second_signature)
+        except Exception as e:
+            return {
+                "result": "fail",
+                "reason": "Invalid second signature: {}".format(str(e))
+            }
+        if signer == account_address:
+            return {
+                "result": "fail",
+                "reason": "Second signature is from the sending account - it must be signed by another owner"
+            }
+        owners = self._fund_owners(contract_address)
+        if owners is None:
+            return None
+        if account_address.lower() not in owners:
+            return {
+                "result": "fail",
+                "reason": "Account {} is not an owner of fund {}".format(account_address, contract_address)
+            }
+        if signer.lower() not in owners:
+            # a signature for another fund or destination recovers to an unrelated address
+            return {
+                "result": "fail",
+                "reason": "Second signature is not from an owner of this fund or was made for a different destination"
+            }
+        return None
+
+    def withdraw(self, contract_address, dest_account, account_add, second_signature, wallet, wait=True, preflight=True):
+        # preflight checks the second signature and simulates the withdraw before sending,
+        # so a withdraw that would revert fails right away without paying gas
+        Fundraiser = w3.eth.contract(
+            address=contract_address,
+            abi=self.abi
+        )
+        
+        account = wallet.create_w3_account(account_add)
+        if account == "Unknown Account":
+            return {
+                "result": "fail",
+                "reason": "Account is unknown or locked. Try unlocking first"
+            }
+        w3.eth.default_account = account.address
+        if preflight:
+            try:
+                res = self._check_second_signature(contract_address, dest_account, account.address, second_signature)
+                if res is None:
+                    r,s,v = self.separate_sig(second_signature)
+                    res = self._preflight(contract_address, account.address, Fundraiser.encodeABI(fn_name="withdraw", args=[dest_account, r, s, v]))
+            except Exception as e:
+                res = {
+                    "result": "fail",
+                    "reason": str(e)
+                }
+            if res is not None:
+                return res
+        balance, funds_withdrawn, expires, goal = Fundraiser.functions.getStatus().call()
+        
+        try:
+            r,s,v = self.separate_sig(second_signature)
+            tx_hash = self._send_transaction(account_add, lambda nonce: Fundraiser.functions.withdraw(dest_account, r, s, v).buildTransaction({'nonce': nonce}), wallet)
+        except Exception as e:
+            return {
+                "result": "fail",
+                "reason": str(e)
+            }
+
+        def on_mined(tx_receipt):
+            self.outbox.put("end_fund", address=contract_address, final_balance=balance, dest_account=dest_account)
+
+        if not wait:
+            return self._submitted(tx_hash, "withdraw", account_add, on_mined)
+
+        tx_receipt, res = self._wait(tx_hash, "withdraw", account_add, on_mined)
+        if res is not None:
+            return res
+        return {
+                "result": "success",
+                "reason": "Successfully withdrew all funds from fundraiser {} to account {}".format(contract_address, dest_account),
+                "balance": balance,
+                "dest_account": dest_account
+            }
+
+    def to_32byte_hex(self, val):
+        return Web3.toHex(Web3.toBytes(val).rjust(32, b'\0'))
+
+
+    def create_signature(self, contract_address, dest_account, account_add, wallet):
+        message = "{}{}".format(dest_account, contract_address)
+        print("signing message: {} with account: {}".format(message, account_add), flush=True)
+        account = wallet.create_w3_account(account_add)
+        if account == "Unknown Account":
+            return {
+                "result": "fail",
+                "reason": "Account is unknown or locked. Try unlocking first"
+            }
+        w3.eth.default_account = account.address
+
+        message = Web3.soliditySha3(['address', 'address'], [Web3.toChecksumAddress(dest_account), Web3.toChecksumAddress(contract_address)])
+
+        signed_message = account.sign_message(encode_defunct(message))
+
+        return {
+            "result": "success",
+            "signed_message": Web3.toHex(signed_message['signature'])
         }
\ No newline at end of file
@@ -0,0 +1,136 @@
+// SPDX-License-Identifier: GPL-3.0
+
+pragma solidity ^0.8.4;
+
+// Fundraiser deployed as an EIP-1167 minimal proxy. The factory deploys one
+// implementation, and every campaign is a 45 byte clone that delegates to it, so
+// creating a campaign doesn't pay for the full contract code again.
+// The interface is the same as fundraiser.sol with initialize taking the place of
+// the constructor.
+contract FundraiserClone {
+    error AlreadyInitialized();
+    error ValueTooLarge();
+    error OwnersMustBeDifferent();
+    error FundExpired();
+    error WrongAmount();
+    error GoalNotReached();
+    error FundNotExpired();
+    error NotAuthorized();
+    error SecondSignerNotAuthorized();
+    error SecondSignerIsSender();
+    error GoalReached();
+    error NoDeposit();
+
+    event Funded(address indexed donor, uint256 amount);
+    event Refunded(address indexed donor, uint256 amount);
+    event Withdrawn(address indexed dest, uint256 amount);
+
+    address private owner1;
+    address private owner2;
+    address private owner3;
+    // one slot
+    uint128 private goal;
+    uint64 private expires;
+    bool private funds_withdrawn;
+    bool private initialized;
+    mapping (address => uint256) private Deposits;
+
+    constructor() {
+        // the implementation itself can never be initialized or used as a fund
+        initialized = true;
+    }
+
+    function initialize(address _owner1, address _owner2, address _owner3, uint256 _goal, uint256 _timelimit_seconds) external {
+        if (initialized) revert AlreadyInitialized();
+        if (_owner1 == _owner2 || _owner2 == _owner3 || _owner1 == _owner3) revert OwnersMustBeDifferent();
+        initialized = true;
+        owner1 = _owner1;
+        owner2 = _owner2;
+        owner3 = _owner3;
+        goal = uint128(_goal);
+        expires = uint64(block.timestamp + _timelimit_seconds);
+        if (goal != _goal || expires != block.timestamp + _timelimit_seconds) revert ValueTooLarge();
+    }
+
+    function getStatus() public view returns (uint256, bool, uint, uint256) {
+        return (address(this).balance, funds_withdrawn, expires, goal);
+    }
+
+    function is_owner(address _wallet) private view returns (bool){
+        return _wallet == owner1 || _wallet == owner2 || _wallet == owner3;
+    }
+
+    function fund(uint256 amount) payable public {
+        if (block.timestamp > expires) revert FundExpired();
+        if (msg.value != amount) revert WrongAmount();
+        unchecked {
+            // can't overflow, the sum of all deposits is at most the ether supply
+            Deposits[msg.sender] += amount;
+        }
+        emit Funded(msg.sender, amount);
+    }
+
+    function getContractBalance() public view returns (uint256) { //view amount of ETH the contract contains
+        return address(this).balance;
+    }
+
+    function withdraw(address payable dest, bytes32 r, bytes32 s, uint8 v) public { // withdraw all ETH previously sent to this contract
+        if (address(this).balance < goal) revert GoalNotReached();
+        if (block.timestamp <= expires) revert FundNotExpired();
+        if (!is_owner(msg.sender)) revert NotAuthorized();
+
+        bytes32 message = keccak256(abi.encodePacked(dest, address(this)));
+        bytes32 messageHash = keccak256(abi.encodePacked("\x19Ethereum Signed Message:\n32", message));
+
+        address second_signer = ecrecover(messageHash, v, r, s);
+
+        if (!is_owner(second_signer)) revert SecondSignerNotAuthorized();
+        if (msg.sender == second_signer) revert SecondSignerIsSender();
+
+        funds_withdrawn = true;
+        emit Withdrawn(dest, address(this).balance);
+        // runs in the context of the clone, only the clone is destroyed
+        selfdestruct(dest);
+    }
+
+    function refund() public {
+        if (block.timestamp <= expires) revert FundNotExpired();
+        if (funds_withdrawn || address(this).balance >= goal) revert GoalReached();
+        uint256 amount = Deposits[msg.sender];
+        if (amount == 0) revert NoDeposit();
+        Deposits[msg.sender] = 0;
+        payable(msg.sender).transfer(amount);
+        emit Refunded(msg.sender, amount);
+    }
+}
+
+
+contract FundraiserFactory {
+    error CloneFailed();
+
+    event FundraiserCreated(address indexed fundraiser, address indexed creator, address owner1, address owner2, address owner3, uint256 goal, uint256 expires);
+
+    address public immutable implementation;
+
+    constructor() {
+        implementation = address(new FundraiserClone());
+    }
+
+    function createFundraiser(address _owner1, address _owner2, address _owner3, uint256 _goal, uint256 _timelimit_seconds) external returns (address fundraiser) {
+        fundraiser = clone(implementation);
+        FundraiserClone(fundraiser).initialize(_owner1, _owner2, _owner3, _goal, _timelimit_seconds);
+        emit FundraiserCreated(fundraiser, msg.sender, _owner1, _owner2, _owner3, _goal, block.timestamp + _timelimit_seconds);
+    }
+
+    function clone(address target) private returns (address instance) {
+        // EIP-1167 runtime code: 363d3d373d3d3d363d73 <target> 5af43d82803e903d91602b57fd5bf3
+        assembly {
+            let ptr := mload(0x40)
+            mstore(ptr, 0x3d602d80600a3d3981f3363d3d373d3d3d363d73000000000000000000000000)
+            mstore(add(ptr, 0x14), shl(0x60, target))
+            mstore(add(ptr, 0x28), 0x5af43d82803e903d91602b57fd5bf30000000000000000000000000000000000)
+            instance := create(0, ptr, 0x37)
+        }
+        if (instance == address(0)) revert CloneFailed();
+    }
+}
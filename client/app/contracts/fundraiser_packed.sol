@@ -0,0 +1,92 @@
+// SPDX-License-Identifier: GPL-3.0
+
+pragma solidity ^0.8.4;
+
+// Same interface as fundraiser.sol with less storage.
+// goal, expires and the owners never change after the constructor so they are
+// immutables kept in the contract code - reading them costs no SLOAD and the
+// constructor doesn't write them to storage. Storage holds only funds_withdrawn
+// and the deposits. Failed checks revert with custom errors instead of strings.
+contract Fundraiser {
+    error OwnersMustBeDifferent();
+    error FundExpired();
+    error WrongAmount();
+    error GoalNotReached();
+    error FundNotExpired();
+    error NotAuthorized();
+    error SecondSignerNotAuthorized();
+    error SecondSignerIsSender();
+    error GoalReached();
+    error NoDeposit();
+
+    event Funded(address indexed donor, uint256 amount);
+    event Refunded(address indexed donor, uint256 amount);
+    event Withdrawn(address indexed dest, uint256 amount);
+
+    address private immutable owner1;
+    address private immutable owner2;
+    address private immutable owner3;
+    uint256 private immutable goal;
+    uint256 private immutable expires;
+    bool funds_withdrawn;
+    mapping (address => uint256) private Deposits;
+
+    constructor(address _owner1, address _owner2, address _owner3, uint256 _goal, uint256 _timelimit_seconds) {
+        if (_owner1 == _owner2 || _owner2 == _owner3 || _owner1 == _owner3) revert OwnersMustBeDifferent();
+        owner1 = _owner1;
+        owner2 = _owner2;
+        owner3 = _owner3;
+        goal = _goal;
+        expires = block.timestamp + _timelimit_seconds;
+    }
+
+    function getStatus() public view returns (uint256, bool, uint, uint256) {
+        return (address(this).balance, funds_withdrawn, expires, goal);
+    }
+
+    function is_owner(address _wallet) private view returns (bool){
+        return _wallet == owner1 || _wallet == owner2 || _wallet == owner3;
+    }
+
+    function fund(uint256 amount) payable public {
+        if (block.timestamp > expires) revert FundExpired();
+        if (msg.value != amount) revert WrongAmount();
+        unchecked {
+            // can't overflow, the sum of all deposits is at most the ether supply
+            Deposits[msg.sender] += amount;
+        }
+        emit Funded(msg.sender, amount);
+    }
+
+    function getContractBalance() public view returns (uint256) { //view amount of ETH the contract contains
+        return address(this).balance;
+    }
+
+    function withdraw(address payable dest, bytes32 r, bytes32 s, uint8 v) public { // withdraw all ETH previously sent to this contract
+        if (address(this).balance < goal) revert GoalNotReached();
+        if (block.timestamp <= expires) revert FundNotExpired();
+        if (!is_owner(msg.sender)) revert NotAuthorized();
+
+        bytes32 message = keccak256(abi.encodePacked(dest, address(this)));
+        bytes32 messageHash = keccak256(abi.encodePacked("\x19Ethereum Signed Message:\n32", message));
+
+        address second_signer = ecrecover(messageHash, v, r, s);
+
+        if (!is_owner(second_signer)) revert SecondSignerNotAuthorized();
+        if (msg.sender == second_signer) revert SecondSignerIsSender();
+
+        funds_withdrawn = true;
+        emit Withdrawn(dest, address(this).balance);
+        selfdestruct(dest);
+    }
+
+    function refund() public {
+        if (block.timestamp <= expires) revert FundNotExpired();
+        if (funds_withdrawn || address(this).balance >= goal) revert GoalReached();
+        uint256 amount = Deposits[msg.sender];
+        if (amount == 0) revert NoDeposit();
+        Deposits[msg.sender] = 0;
+        payable(msg.sender).transfer(amount);
+        emit Refunded(msg.sender, amount);
+    }
+}
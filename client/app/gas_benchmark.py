@@ -0,0 +1,113 @@
+import os
+import sys
+import json
+from web3 import Web3
+from eth_account.messages import encode_defunct
+from contract_artifacts import load_artifacts
+
+# Gas used by every operation of the fundraiser contract variants, measured on an
+# in-process EVM (eth-tester with the py-evm backend) so the numbers are the same on
+# every run. Funds of the factory variant are measured as clones, the one time
+# deployment of the factory is left out. Needs eth-tester and py-evm, which are not
+# runtime dependencies:
+#   pip install "eth-tester[py-evm]"
+#   python3 app/gas_benchmark.py [--json] [source files...]
+
+DEFAULT_SOURCES = ["app/contracts/fundraiser.sol", "app/contracts/fundraiser_packed.sol", "app/contracts/fundraiser_factory.sol"]
+GOAL = Web3.toWei(2, "ether")
+DONATION = Web3.toWei(1, "ether")
+TIME_LIMIT = 3600 # in seconds
+
+
+def new_chain():
+    from eth_tester import EthereumTester, PyEVMBackend
+    tester = EthereumTester(PyEVMBackend())
+    return tester, Web3(Web3.EthereumTesterProvider(tester))
+
+
+def gas_used(w3, tx_hash):
+    return w3.eth.wait_for_transaction_receipt(tx_hash)["gasUsed"]
+
+
+def fundraiser_deployer(w3, artifacts, sender):
+    # Returns deploy(owners) -> (fund contract, gas used) for the variant in artifacts.
+    # Factory variants deploy the factory once here and create every fund as a clone
+    if "FundraiserFactory" not in artifacts:
+        artifact = artifacts["Fundraiser"]
+        Fundraiser = w3.eth.contract(abi=artifact["abi"], bytecode=artifact["bytecode"])
+
+        def deploy(owners):
+            receipt = w3.eth.wait_for_transaction_receipt(Fundraiser.constructor(*owners, GOAL, TIME_LIMIT).transact({"from": sender}))
+            return w3.eth.contract(address=receipt["contractAddress"], abi=artifact["abi"]), receipt["gasUsed"]
+        return deploy
+
+    Factory = w3.eth.contract(abi=artifacts["FundraiserFactory"]["abi"], bytecode=artifacts["FundraiserFactory"]["bytecode"])
+    receipt = w3.eth.wait_for_transaction_receipt(Factory.constructor().transact({"from": sender}))
+    factory = w3.eth.contract(address=receipt["contractAddress"], abi=artifacts["FundraiserFactory"]["abi"])
+
+    def deploy(owners):
+        receipt = w3.eth.wait_for_transaction_receipt(factory.functions.createFundraiser(*owners, GOAL, TIME_LIMIT).transact({"from": sender}))
+        address = factory.events.FundraiserCreated().processReceipt(receipt)[0]["args"]["fundraiser"]
+        return w3.eth.contract(address=address, abi=artifacts["FundraiserClone"]["abi"]), receipt["gasUsed"]
+    return deploy
+
+
+def time_travel(tester, seconds):
+    tester.time_travel(tester.get_block_by_number("pending")["timestamp"] + seconds)
+    tester.mine_blocks()
+
+
+def sign_withdrawal(account, dest, contract_address):
+    message = Web3.soliditySha3(['address', 'address'], [dest, contract_address])
+    signature = account.sign_message(encode_defunct(message))
+    return Web3.toBytes(signature.r).rjust(32, b'\0'), Web3.toBytes(signature.s).rjust(32, b'\0'), signature.v
+
+
+def measure(artifacts):
+    # returns operation -> gas used
+    tester, w3 = new_chain()
+    sender, donor1, donor2, dest = w3.eth.accounts[:4]
+    owner_accounts = [w3.eth.account.create() for _ in range(3)]
+    for i in owner_accounts:
+        w3.eth.send_transaction({"from": sender, "to": i.address, "value": Web3.toWei(1, "ether")})
+        tester.add_account(Web3.toHex(i.key))
+    owners = [i.address for i in owner_accounts]
+    deploy = fundraiser_deployer(w3, artifacts, sender)
+    res = dict()
+
+    # a fund that reaches its goal and is withdrawn
+    fundraiser, res["deploy"] = deploy(owners)
+    res["fund (first donation)"] = gas_used(w3, fundraiser.functions.fund(DONATION).transact({"from": donor1, "value": DONATION}))
+    res["fund (repeat donation)"] = gas_used(w3, fundraiser.functions.fund(DONATION).transact({"from": donor1, "value": DONATION}))
+    res["getStatus (eth_call)"] = fundraiser.functions.getStatus().estimateGas()
+    time_travel(tester, TIME_LIMIT + 1)
+    r, s, v = sign_withdrawal(owner_accounts[1], dest, fundraiser.address)
+    res["withdraw"] = gas_used(w3, fundraiser.functions.withdraw(dest, r, s, v).transact({"from": owners[0]}))
+
+    # a fund that misses its goal and is refunded
+    fundraiser, _ = deploy(owners)
+    fundraiser.functions.fund(DONATION).transact({"from": donor2, "value": DONATION})
+    time_travel(tester, TIME_LIMIT + 1)
+    res["refund"] = gas_used(w3, fundraiser.functions.refund().transact({"from": donor2}))
+    return res
+
+
+def main(args):
+    as_json = "--json" in args
+    sources = [i for i in args if i != "--json"] or DEFAULT_SOURCES
+    results = {source: measure(load_artifacts(source)) for source in sources}
+    if as_json:
+        print(json.dumps(results, indent=2))
+        return
+    names = [os.path.basename(i) for i in sources]
+    print("{:<24}".format("operation") + "".join("{:>26}".format(i) for i in names))
+    for operation in results[sources[0]]:
+        row = [results[i][operation] for i in sources]
+        cells = ["{:>26}".format(row[0])]
+        for value in row[1:]:
+            cells.append("{:>26}".format("{} ({:+.1f}%)".format(value, (value - row[0]) * 100 / row[0])))
+        print("{:<24}".format(operation) + "".join(cells))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
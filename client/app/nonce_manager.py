@@ -0,0 +1,52 @@
+import threading
+
+# errors from the node that mean the local nonce of the account is out of date
+NONCE_ERRORS = ("nonce too low", "replacement transaction underpriced")
+
+
+def is_nonce_error(e):
+    message = str(e).lower()
+    return any(i in message for i in NONCE_ERRORS)
+
+
+# Hands out nonces per account locally so transactions from the same account can
+# be sent back to back without waiting for receipts or asking the node every time.
+# The nonce of an account is read from the chain the first time it's used and
+# again after resync is called.
+class NonceManager:
+    def __init__(self, w3) -> None:
+        self.w3 = w3
+        self.lock = threading.Lock()
+        self.accounts = dict() # account -> {"lock": Lock, "next": next nonce or None}
+
+    def _account(self, account):
+        with self.lock:
+            if account not in self.accounts:
+                self.accounts[account] = {"lock": threading.Lock(), "next": None}
+            return self.accounts[account]
+
+    def allocate(self, account, count=1):
+        # reserves count sequential nonces and returns the first one
+        state = self._account(account)
+        with state["lock"]:
+            if state["next"] is None:
+                state["next"] = self.w3.eth.get_transaction_count(account, 'pending')
+            nonce = state["next"]
+            state["next"] += count
+            return nonce
+
+    def release(self, account, nonce):
+        # called when a transaction with this nonce was never sent.
+        # If it was the last nonce handed out it's simply reused, otherwise
+        # there is a gap and the account is read from the chain again
+        state = self._account(account)
+        with state["lock"]:
+            if state["next"] == nonce + 1:
+                state["next"] = nonce
+            else:
+                state["next"] = None
+
+    def resync(self, account):
+        state = self._account(account)
+        with state["lock"]:
+            state["next"] = None
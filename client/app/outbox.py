@@ -0,0 +1,106 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+OUTBOX_BATCH_SIZE = int(os.environ.get("OUTBOX_BATCH_SIZE", 50))
+OUTBOX_RETRY_DELAY = float(os.environ.get("OUTBOX_RETRY_DELAY", 2)) # in seconds, doubled every failed attempt
+OUTBOX_MAX_RETRY_DELAY = float(os.environ.get("OUTBOX_MAX_RETRY_DELAY", 300)) # in seconds
+OUTBOX_MAX_ATTEMPTS = int(os.environ.get("OUTBOX_MAX_ATTEMPTS", 50))
+
+
+# Durable queue of calls to the server that have to happen after an on-chain action
+# (registering a new fund, ending a fund). Calls are stored in an SQLite file before
+# the user gets a response, and a background thread delivers them in batches.
+# A call that raises - it failed to reach the server or the server didn't accept it -
+# stays in the outbox and is retried with backoff, also after a restart of the client.
+# A call that raises one of the refused exceptions or fails OUTBOX_MAX_ATTEMPTS times
+# is kept in the outbox as failed and isn't sent again.
+class Outbox(threading.Thread):
+    def __init__(self, path, senders, refused=()) -> None:
+        # senders is a dict of kind -> function called with the stored kwargs, refused
+        # the exception types of calls the server will never accept
+        super().__init__(daemon=True)
+        self.senders = senders
+        self.refused = refused
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            kwargs TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt REAL NOT NULL
+        )""")
+        columns = [i[1] for i in self.conn.execute("PRAGMA table_info(outbox)")]
+        if "failed" not in columns:
+            self.conn.execute("ALTER TABLE outbox ADD COLUMN failed INTEGER NOT NULL DEFAULT 0")
+
+    def put(self, kind, **kwargs):
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO outbox (kind, kwargs, next_attempt) VALUES (?, ?, ?)",
+                (kind, json.dumps(kwargs), time.time())
+            )
+        self.wake.set()
+
+    def pending(self):
+        with self.lock:
+            return self.conn.execute("SELECT count(*) FROM outbox WHERE failed = 0").fetchone()[0]
+
+    def failed(self):
+        with self.lock:
+            return self.conn.execute("SELECT count(*) FROM outbox WHERE failed = 1").fetchone()[0]
+
+    def _due(self):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT id, kind, kwargs, attempts FROM outbox WHERE failed = 0 AND next_attempt <= ? ORDER BY id LIMIT ?",
+                (time.time(), OUTBOX_BATCH_SIZE)
+            ).fetchall()
+
+    def _next_due(self):
+        with self.lock:
+            row = self.conn.execute("SELECT min(next_attempt) FROM outbox WHERE failed = 0").fetchone()
+        return row[0]
+
+    def deliver(self):
+        # sends one batch of due calls, returns how many were delivered
+        batch = self._due()
+        delivered, retried, failed = [], [], []
+        for call_id, kind, kwargs, attempts in batch:
+            try:
+                res = self.senders[kind](**json.loads(kwargs))
+                print("Delivered {} {}: {}".format(kind, call_id, res), flush=True)
+                delivered.append((call_id,))
+            except Exception as e:
+                if isinstance(e, self.refused) or attempts + 1 >= OUTBOX_MAX_ATTEMPTS:
+                    print("Gave up delivering {} {} after {} attempts: {}".format(kind, call_id, attempts + 1, e), flush=True)
+                    failed.append((call_id,))
+                    continue
+                print("Failed to deliver {} {}: {}".format(kind, call_id, e), flush=True)
+                delay = min(OUTBOX_RETRY_DELAY * 2 ** attempts, OUTBOX_MAX_RETRY_DELAY)
+                retried.append((time.time() + delay, call_id))
+        with self.lock:
+            with self.conn:
+                self.conn.execute("BEGIN")
+                self.conn.executemany("DELETE FROM outbox WHERE id = ?", delivered)
+                self.conn.executemany("UPDATE outbox SET attempts = attempts + 1, next_attempt = ? WHERE id = ?", retried)
+                self.conn.executemany("UPDATE outbox SET attempts = attempts + 1, failed = 1 WHERE id = ?", failed)
+        return len(delivered)
+
+    def run(self):
+        while True:
+            self.wake.clear()
+            try:
+                while self.deliver() > 0:
+                    pass
+                next_due = self._next_due()
+            except Exception as e:
+                print("Outbox failed: {}".format(e), flush=True)
+                next_due = time.time() + OUTBOX_RETRY_DELAY
+            timeout = None if next_due is None else max(0, next_due - time.time())
+            self.wake.wait(timeout)
@@ -1,40 +1,236 @@
-import requests
-import os
-
-MANAGER_HOST = os.environ.get("FUND_MANAGER_HOST")
-MANAGER_API_PORT = os.environ.get("FUND_MANAGER_API_PORT")
-
-def gen_url(api_url):
-    return f"http://{MANAGER_HOST}:{MANAGER_API_PORT}{api_url}"
-
-def get_list():
-    url =  gen_url("/api/campaign/list")
-    return requests.get(url).content.decode()
-
-def get_info(pk):
-    url = gen_url("/api/campaign/info")
-    params = {
-        "address": pk
-    }
-    return requests.get(url, params=params).content.decode()
-
-def new_fund(address, owner1, owner2, owner3, name, description):
-    url = gen_url("/api/campaign/create")
-    params = {
-        "address": address,
-        "owner1": owner1,
-        "owner2": owner2,
-        "owner3": owner3,
-        "name": name,
-        "description": description
-    }
-    return requests.post(url, params=params).content.decode()
-
-def end_fund(address, final_balance, dest_account):
-    url = gen_url("/api/campaign/end")
-    params = {
-        "address": address,
-        "final_balance": final_balance,
-        "dest_account": dest_account,
-    }
-    return requests.post(url, params=params).content.decode()
\ No newline at end of file
+import json
+import requests
+import os
+import random
+import threading
+import time
+from requests.adapters import HTTPAdapter
+
+MANAGER_HOST = os.environ.get("FUND_MANAGER_HOST")
+MANAGER_API_PORT = os.environ.get("FUND_MANAGER_API_PORT")
+
+SERVER_CONNECT_TIMEOUT = float(os.environ.get("SERVER_CONNECT_TIMEOUT", 3)) # in seconds
+SERVER_READ_TIMEOUT = float(os.environ.get("SERVER_READ_TIMEOUT", 15)) # in seconds
+SERVER_POOL_SIZE = int(os.environ.get("SERVER_POOL_SIZE", 20))
+SERVER_RETRIES = int(os.environ.get("SERVER_RETRIES", 3)) # attempts of idempotent requests
+SERVER_RETRY_BACKOFF = float(os.environ.get("SERVER_RETRY_BACKOFF", 0.2)) # in seconds, doubled every attempt
+BREAKER_FAILURES = int(os.environ.get("SERVER_BREAKER_FAILURES", 5))
+BREAKER_RESET = float(os.environ.get("SERVER_BREAKER_RESET", 15)) # in seconds
+CACHE_TTL = float(os.environ.get("SERVER_CACHE_TTL", 5)) # in seconds
+CACHE_STALE = float(os.environ.get("SERVER_CACHE_STALE", 60)) # in seconds, stale responses served while refreshing
+CACHE_SIZE = int(os.environ.get("SERVER_CACHE_SIZE", 1000))
+
+RETRY_STATUS = (502, 503, 504)
+INFO_BATCH_SIZE = 500 # addresses per info_batch call, the most the server accepts
+
+# One keep-alive connection pool for all the calls to the server
+session = requests.Session()
+adapter = HTTPAdapter(pool_connections=1, pool_maxsize=SERVER_POOL_SIZE)
+session.mount("http://", adapter)
+session.mount("https://", adapter)
+
+
+class ServerUnavailable(Exception):
+    pass
+
+
+class ServerRejected(Exception):
+    pass
+
+
+# The server will never accept the call, sending it again doesn't help
+class ServerRefused(ServerRejected):
+    pass
+
+
+# Stops calling the server after BREAKER_FAILURES failures in a row, so requests fail
+# right away instead of each one waiting for a timeout. After BREAKER_RESET seconds a
+# single request is let through to check whether the server is back.
+class CircuitBreaker:
+    def __init__(self, failures=BREAKER_FAILURES, reset=BREAKER_RESET) -> None:
+        self.max_failures = failures
+        self.reset = reset
+        self.lock = threading.Lock()
+        self.failures = 0
+        self.opened = None
+        self.probing = False
+
+    def allow(self):
+        with self.lock:
+            if self.opened is None:
+                return True
+            if not self.probing and time.time() - self.opened >= self.reset:
+                self.probing = True
+                return True
+            return False
+
+    def success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened = None
+            self.probing = False
+
+    def failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.probing or self.failures >= self.max_failures:
+                self.opened = time.time()
+            self.probing = False
+
+
+breaker = CircuitBreaker()
+
+
+def gen_url(api_url):
+    return f"http://{MANAGER_HOST}:{MANAGER_API_PORT}{api_url}"
+
+def call_server(method, api_url, idempotent=None, **kwargs):
+    # Returns the decoded body of the response
+    return request_server(method, api_url, idempotent, **kwargs).content.decode()
+
+def request_server(method, api_url, idempotent=None, **kwargs):
+    # Returns the response. Idempotent requests (GET by default) are retried with
+    # jittered exponential backoff on connection errors and 502-504
+    if idempotent is None:
+        idempotent = method == "GET"
+    attempts = SERVER_RETRIES if idempotent else 1
+    for attempt in range(attempts):
+        if not breaker.allow():
+            raise ServerUnavailable("Server is unavailable, try again later")
+        try:
+            response = session.request(method, gen_url(api_url), timeout=(SERVER_CONNECT_TIMEOUT, SERVER_READ_TIMEOUT), **kwargs)
+            if response.status_code not in RETRY_STATUS:
+                breaker.success()
+                return response
+            error = ServerUnavailable("Server returned {}".format(response.status_code))
+        except requests.RequestException as e:
+            error = e
+        breaker.failure()
+        if attempt + 1 < attempts:
+            time.sleep(random.uniform(0, SERVER_RETRY_BACKOFF * 2 ** attempt))
+    raise error
+
+
+# Responses of list and info calls are kept for CACHE_TTL seconds. For CACHE_STALE
+# seconds after that an expired response is still returned right away while a
+# background thread gets a fresh one.
+class ResponseCache:
+    def __init__(self, ttl=CACHE_TTL, stale=CACHE_STALE, size=CACHE_SIZE) -> None:
+        self.ttl = ttl
+        self.stale = stale
+        self.size = size
+        self.lock = threading.Lock()
+        self.entries = dict() # key -> (time, response)
+        self.refreshing = set()
+
+    def _refresh(self, key, fetch):
+        try:
+            self.put(key, fetch())
+        except Exception as e:
+            print("Failed to refresh {}: {}".format(key, e), flush=True)
+        finally:
+            with self.lock:
+                self.refreshing.discard(key)
+
+    def put(self, key, response):
+        with self.lock:
+            self.entries[key] = (time.time(), response)
+            if len(self.entries) > self.size:
+                # full, drop the oldest entry
+                oldest = min(self.entries, key=lambda i: self.entries[i][0])
+                del self.entries[oldest]
+
+    def get(self, key, fetch):
+        with self.lock:
+            entry = self.entries.get(key)
+            age = time.time() - entry[0] if entry is not None else None
+            if age is not None and age < self.ttl:
+                return entry[1]
+            if age is not None and age < self.ttl + self.stale:
+                if key not in self.refreshing:
+                    self.refreshing.add(key)
+                    threading.Thread(target=self._refresh, args=(key, fetch), daemon=True).start()
+                return entry[1]
+        response = fetch()
+        self.put(key, response)
+        return response
+
+
+cache = ResponseCache()
+
+
+def cache_key(api_url, params):
+    return (api_url, tuple(sorted((params or dict()).items())))
+
+def get_list(params=None):
+    # params are the paging and filter params of the server, without them the whole list is returned
+    params = dict(params or dict())
+    return cache.get(cache_key("/api/campaign/list", params), lambda: call_server("GET", "/api/campaign/list", params=params))
+
+def get_changes(since):
+    params = {
+        "since": since
+    }
+    return call_server("GET", "/api/campaign/changes", params=params)
+
+def search(params):
+    # params are q and the paging and filter params of the server search
+    return call_server("GET", "/api/campaign/search", params=dict(params))
+
+def get_info(pk):
+    params = {
+        "address": pk
+    }
+    return cache.get(cache_key("/api/campaign/info", params), lambda: call_server("GET", "/api/campaign/info", params=params))
+
+def get_info_batch(addresses):
+    # Returns {"campaigns": [...], "not_found": [...]} of any number of addresses, asked in
+    # calls of at most INFO_BATCH_SIZE. Raises ServerRejected if the server refuses a call
+    res = {"campaigns": [], "not_found": []}
+    for start in range(0, len(addresses), INFO_BATCH_SIZE):
+        body = call_server("POST", "/api/campaign/info_batch", idempotent=True, json={"addresses": addresses[start:start + INFO_BATCH_SIZE]})
+        try:
+            chunk = json.loads(body)
+            res["campaigns"] += chunk["campaigns"]
+            res["not_found"] += chunk["not_found"]
+        except (ValueError, KeyError, TypeError):
+            raise ServerRejected("Server rejected the call: {}".format(body[:200]))
+    return res
+
+def accepted_result(response, accepted):
+    # Registrations are delivered from the outbox, which only drops a call when it
+    # returns. A response with a status in accepted returns its result. A client error
+    # or invalid params raise ServerRefused and the call is given up, any other
+    # response - an error page or a failed result - raises so the call is retried
+    body = response.content.decode()
+    if 400 <= response.status_code < 500:
+        raise ServerRefused("Server refused the call with {}: {}".format(response.status_code, body[:200]))
+    try:
+        res = json.loads(body)
+        status = res.get("status")
+    except (ValueError, AttributeError):
+        raise ServerRejected("Unexpected response from server: {}".format(body[:200]))
+    if status == "invalid":
+        raise ServerRefused("Server refused the call: {}".format(body[:200]))
+    if status not in accepted:
+        raise ServerRejected("Server rejected the call: {}".format(body[:200]))
+    return res.get("result")
+
+def new_fund(address, owner1, owner2, owner3, name, description):
+    params = {
+        "address": address,
+        "owner1": owner1,
+        "owner2": owner2,
+        "owner3": owner3,
+        "name": name,
+        "description": description
+    }
+    return accepted_result(request_server("POST", "/api/campaign/create", params=params), ("pending", "registered"))
+
+def end_fund(address, final_balance, dest_account):
+    params = {
+        "address": address,
+        "final_balance": final_balance,
+        "dest_account": dest_account,
+    }
+    return accepted_result(request_server("POST", "/api/campaign/end", params=params), ("pending",))
@@ -0,0 +1,202 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.datastructures import AttributeDict
+from web3.exceptions import TransactionNotFound
+from rpc_batch import batch_request
+
+TRACKER_POLL_INTERVAL = float(os.environ.get("TRACKER_POLL_INTERVAL", 2)) # in seconds
+RECEIPT_TIMEOUT = int(os.environ.get("RECEIPT_TIMEOUT", 120)) # in seconds
+# a transaction without a receipt for this long is checked with the node, if the node
+# doesn't know it anymore it was dropped from the mempool and is no longer watched
+DROP_TIMEOUT = int(os.environ.get("TX_DROP_TIMEOUT", 600)) # in seconds
+MAX_FINISHED_TXS = 10000 # finished transactions kept around for status queries
+RECEIPT_INTS = {"blockNumber", "cumulativeGasUsed", "effectiveGasPrice", "gasUsed", "logIndex", "status", "transactionIndex", "type"}
+RECEIPT_BYTES = {"blockHash", "logsBloom", "root", "transactionHash"}
+RECEIPT_ADDRESSES = {"address", "contractAddress", "from", "to"}
+
+
+def _format_receipt_value(key, value):
+    if value is None:
+        return None
+    if key in RECEIPT_INTS:
+        return Web3.toInt(hexstr=value)
+    if key in RECEIPT_BYTES:
+        return HexBytes(value)
+    if key in RECEIPT_ADDRESSES:
+        return Web3.toChecksumAddress(value)
+    return value
+
+
+def format_receipt(raw):
+    # a raw eth_getTransactionReceipt result in the form w3.eth.get_transaction_receipt
+    # returns, so contract events can be decoded from it
+    receipt = {k: _format_receipt_value(k, v) for k, v in raw.items() if k != "logs"}
+    receipt["logs"] = [
+        AttributeDict(dict({k: _format_receipt_value(k, v) for k, v in log.items()}, topics=[HexBytes(i) for i in log["topics"]]))
+        for log in raw.get("logs", [])
+    ]
+    return AttributeDict(receipt)
+
+
+# Single receipt watcher for every transaction sent by the client.
+# The watcher checks the chain for a new block and then fetches the receipts of
+# all pending transactions in one batch, so the load on the node grows with the
+# block rate and not with the number of transactions waiting for a receipt.
+# Requests that need the receipt wait on a future, async transactions get their
+# post mining callback run by the watcher.
+class TransactionDropped(Exception):
+    pass
+
+
+class TxTracker(threading.Thread):
+    def __init__(self, w3, on_dropped=None) -> None:
+        # on_dropped is called with the sender of every dropped transaction
+        super().__init__(daemon=True)
+        self.w3 = w3
+        self.on_dropped = on_dropped
+        self.lock = threading.Lock()
+        self.pending = dict()
+        self.finished = OrderedDict()
+        self.last_block = None
+        self.counters = {
+            "mined": 0,
+            "reverted": 0,
+            "dropped": 0,
+            "total_time_to_receipt": 0.0,
+            "max_time_to_receipt": 0.0
+        }
+
+    def track(self, tx_hash, kind, on_mined=None, sender=None):
+        # tx_hash is bytes from web3 or a hex string from a batch request
+        tx_hash = Web3.toHex(hexstr=tx_hash) if isinstance(tx_hash, str) else Web3.toHex(tx_hash)
+        with self.lock:
+            if tx_hash not in self.pending and tx_hash not in self.finished:
+                self.pending[tx_hash] = {
+                    "tx_hash": tx_hash,
+                    "kind": kind,
+                    "status": "pending",
+                    "submitted": time.time(),
+                    "checked_block": None,
+                    "on_mined": on_mined,
+                    "sender": sender,
+                    "future": Future()
+                }
+        return tx_hash
+
+    def wait_for_receipt(self, tx_hash, kind="external", timeout=RECEIPT_TIMEOUT):
+        # blocks until the watcher sees the receipt, raises concurrent.futures.TimeoutError
+        # or TransactionDropped
+        tx_hash = self.track(tx_hash, kind)
+        with self.lock:
+            entry = self.pending.get(tx_hash) or self.finished.get(tx_hash)
+        if entry is None:
+            # finished long ago and no longer kept, the receipt is on the chain
+            return self.w3.eth.get_transaction_receipt(tx_hash)
+        return entry["future"].result(timeout)
+
+    def status(self, tx_hash):
+        with self.lock:
+            entry = self.pending.get(tx_hash) or self.finished.get(tx_hash)
+        if entry is not None:
+            return {k: v for k, v in entry.items() if k not in ("on_mined", "future", "checked_block")}
+        # not sent through this client, ask the chain directly
+        try:
+            receipt = self.w3.eth.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            return {
+                "tx_hash": tx_hash,
+                "status": "unknown"
+            }
+        return self._finished_entry({"tx_hash": tx_hash}, receipt)
+
+    def get_counters(self):
+        with self.lock:
+            receipts = self.counters["mined"] + self.counters["reverted"]
+            return {
+                "pending": len(self.pending),
+                "mined": self.counters["mined"],
+                "reverted": self.counters["reverted"],
+                "dropped": self.counters["dropped"],
+                "avg_time_to_receipt": self.counters["total_time_to_receipt"] / receipts if receipts else None,
+                "max_time_to_receipt": self.counters["max_time_to_receipt"],
+                "last_block": self.last_block
+            }
+
+    def _finished_entry(self, entry, receipt):
+        entry["status"] = "mined" if receipt["status"] == 1 else "reverted"
+        entry["receipt"] = json.loads(Web3.toJSON(receipt))
+        return entry
+
+    def _finish(self, entry, receipt):
+        self._finished_entry(entry, receipt)
+        time_to_receipt = time.time() - entry["submitted"]
+        if entry["status"] == "mined" and entry["on_mined"] is not None:
+            try:
+                entry["on_mined"](receipt)
+            except Exception as e:
+                print("Post mining action of {} failed: {}".format(entry["tx_hash"], str(e)), flush=True)
+        with self.lock:
+            self.counters[entry["status"]] += 1
+            self.counters["total_time_to_receipt"] += time_to_receipt
+            self.counters["max_time_to_receipt"] = max(self.counters["max_time_to_receipt"], time_to_receipt)
+            self.pending.pop(entry["tx_hash"], None)
+            self.finished[entry["tx_hash"]] = entry
+            while len(self.finished) > MAX_FINISHED_TXS:
+                self.finished.popitem(last=False)
+        entry["future"].set_result(receipt)
+
+    def _drop(self, entry):
+        entry["status"] = "dropped"
+        print("Transaction {} was dropped".format(entry["tx_hash"]), flush=True)
+        with self.lock:
+            self.counters["dropped"] += 1
+            self.pending.pop(entry["tx_hash"], None)
+            self.finished[entry["tx_hash"]] = entry
+            while len(self.finished) > MAX_FINISHED_TXS:
+                self.finished.popitem(last=False)
+        if self.on_dropped is not None and entry["sender"] is not None:
+            try:
+                self.on_dropped(entry["sender"])
+            except Exception as e:
+                print("Dropped transaction action of {} failed: {}".format(entry["tx_hash"], str(e)), flush=True)
+        entry["future"].set_exception(TransactionDropped("Transaction {} was dropped by the node without being mined".format(entry["tx_hash"])))
+
+    def check_pending(self, block):
+        # every pending transaction is checked once per block, new ones right away.
+        # Transactions waiting longer than DROP_TIMEOUT are also looked up in the same batch
+        with self.lock:
+            entries = [i for i in self.pending.values() if i["checked_block"] != block]
+        if len(entries) == 0:
+            return
+        old = [i for i in entries if time.time() - i["submitted"] > DROP_TIMEOUT]
+        results = batch_request(
+            [("eth_getTransactionReceipt", [i["tx_hash"]]) for i in entries] +
+            [("eth_getTransactionByHash", [i["tx_hash"]]) for i in old]
+        )
+        known = {i["tx_hash"]: result for i, result in zip(old, results[len(entries):])}
+        for entry, result in zip(entries, results):
+            entry["checked_block"] = block
+            if isinstance(result, Exception):
+                print("Failed to get receipt for {}: {}".format(entry["tx_hash"], str(result)), flush=True)
+                continue
+            if result is None:
+                if entry["tx_hash"] in known and known[entry["tx_hash"]] is None:
+                    self._drop(entry)
+                continue
+            self._finish(entry, format_receipt(result))
+
+    def run(self):
+        while True:
+            try:
+                self.last_block = self.w3.eth.block_number
+                self.check_pending(self.last_block)
+            except Exception as e:
+                print("Receipt watcher failed: {}".format(str(e)), flush=True)
+            time.sleep(TRACKER_POLL_INTERVAL)
@@ -0,0 +1,123 @@
+import hashlib, hmac
+from Crypto.Random.random import randint
+from Crypto.Cipher import AES
+from Crypto.Protocol.KDF import scrypt
+from Crypto.Util.Padding import pad, unpad
+from Crypto.Random import get_random_bytes
+from eth_account import Account
+from eth_account.hdaccount import generate_mnemonic, seed_from_mnemonic
+from eth_account.hdaccount.deterministic import Node, SoftNode, derive_child_key
+from eth_keys import keys
+from web3 import Web3
+
+# Key generation and key encryption used by the wallet.
+# These are plain functions of their arguments so they can also run in worker processes.
+
+# order of the secp256k1 curve
+N = int("FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141", 16)
+
+# BIP44 path of ethereum accounts, HD account i is HD_ACCOUNT_PATH/i
+HD_ACCOUNT_PATH = "m/44'/60'/0'/0"
+
+
+def generate_key_pair():
+    # eth_keys uses libsecp256k1 (coincurve) when it is installed
+    private_key = randint(1, N - 1)
+    public_key = keys.PrivateKey(private_key.to_bytes(32, 'big')).public_key
+    return public_key.to_bytes().hex(), private_key
+
+
+def encrypt_key_with_password(key, password):
+    return encrypt_hex_with_password(Web3.toHex(key)[2:], password)
+
+
+def encrypt_hex_with_password(secret_hex, password):
+    salt = get_random_bytes(16)
+    enc_key = scrypt(password, salt, 32, N = 2**14, r = 8, p = 1)
+    data = str(secret_hex).encode('utf-8')
+    cipher = AES.new(enc_key, AES.MODE_CBC)
+    ct_bytes = cipher.encrypt(pad(data, AES.block_size))
+    salt = salt.hex()
+    iv = cipher.iv.hex()
+    ct = ct_bytes.hex()
+    return salt, iv, ct
+
+
+def decrypt_hex_with_password(data, password):
+    salt = bytes.fromhex(data['salt'])
+    iv = bytes.fromhex(data['iv'])
+    ct = bytes.fromhex(data['ct'])
+
+    enc_key = scrypt(password, salt, 32, N = 2**14, r = 8, p = 1)
+
+    cipher = AES.new(enc_key, AES.MODE_CBC, iv)
+    return unpad(cipher.decrypt(ct), AES.block_size).decode('utf-8')
+
+
+def decrypt_key_with_password(address, data, password):
+    private_key = int(decrypt_hex_with_password(data, password), 16)
+
+    if Account.from_key(private_key).address != address:
+        raise Exception("Wrong password")
+    return private_key
+
+
+def decrypt_keys_with_passwords(jobs):
+    # jobs is a list of (address, data, password), wrong passwords give None
+    res = []
+    for address, data, password in jobs:
+        try:
+            res.append(decrypt_key_with_password(address, data, password))
+        except Exception:
+            res.append(None)
+    return res
+
+
+def new_encrypted_account(password):
+    # returns (address, private_key, keystore entry) of a new random key
+    public_key_hex, private_key = generate_key_pair()
+    address = Web3.toChecksumAddress("0x" + Web3.keccak(hexstr = public_key_hex).hex()[-40:])
+    salt, iv, ct = encrypt_key_with_password(private_key, password)
+    return address, private_key, {
+        "salt": salt,
+        "iv": iv,
+        "ct": ct
+    }
+
+
+def new_encrypted_accounts(password, count):
+    return [new_encrypted_account(password) for _ in range(count)]
+
+
+def new_mnemonic():
+    return generate_mnemonic(12, "english")
+
+
+def seed_from_words(mnemonic):
+    return seed_from_mnemonic(mnemonic, "")
+
+
+def hd_parent_node(seed):
+    # key and chain code of HD_ACCOUNT_PATH, derived once so every account
+    # below it costs a single child derivation
+    node = hmac.new(b"Bitcoin seed", seed, hashlib.sha512).digest()
+    key, chain_code = node[:32], node[32:]
+    for i in HD_ACCOUNT_PATH.split("/")[1:]:
+        key, chain_code = derive_child_key(key, chain_code, Node.decode(i))
+    return key, chain_code
+
+
+def derive_hd_key(parent_node, index):
+    key, chain_code = derive_child_key(parent_node[0], parent_node[1], SoftNode(index))
+    return int.from_bytes(key, 'big')
+
+
+def new_hd_seed(password, mnemonic):
+    # returns the parent node and the encrypted seed of a mnemonic
+    seed = seed_from_words(mnemonic)
+    salt, iv, ct = encrypt_hex_with_password(seed.hex(), password)
+    return hd_parent_node(seed), salt, iv, ct
+
+
+def unlock_hd_seed(record, password):
+    return hd_parent_node(bytes.fromhex(decrypt_hex_with_password(record, password)))
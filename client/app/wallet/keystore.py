@@ -0,0 +1,142 @@
+import json
+import os
+import sqlite3
+import threading
+
+
+# Storage backends for the encrypted keys of the wallet.
+# Both behave like a dict of address -> {"salt", "iv", "ct"} entries, every change
+# is written to disk right away. Wallet wide records (like the HD seed) are kept
+# apart from the keys with get_meta / set_meta.
+
+META_KEY = "__meta__" # json keystore only
+
+class JsonKeystore:
+    # Original format - the whole wallet in one json file, rewritten on every change
+    def __init__(self, path) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+        try:
+            with open(path, "r") as f:
+                self.data = json.loads(f.read())
+        except FileNotFoundError:
+            self.data = dict()
+
+    def _write(self):
+        tmp_path = "{}.tmp".format(self.path)
+        with open(tmp_path, "w") as f:
+            f.write(json.dumps(self.data))
+        os.replace(tmp_path, self.path)
+
+    def keys(self):
+        with self.lock:
+            return [i for i in self.data.keys() if i != META_KEY]
+
+    def __contains__(self, address):
+        return address != META_KEY and address in self.data
+
+    def get_meta(self, key):
+        return self.data.get(META_KEY, dict()).get(key)
+
+    def set_meta(self, key, value):
+        with self.lock:
+            self.data.setdefault(META_KEY, dict())[key] = value
+            self._write()
+
+    def __getitem__(self, address):
+        return self.data[address]
+
+    def __setitem__(self, address, entry):
+        self.update({address: entry})
+
+    def update(self, entries):
+        with self.lock:
+            self.data.update(entries)
+            self._write()
+
+    def __delitem__(self, address):
+        with self.lock:
+            del self.data[address]
+            self._write()
+
+
+class SqliteKeystore:
+    # One row per key - adding or deleting a key writes only that row in its own
+    # transaction, and entries are read from disk only when they are needed
+    def __init__(self, path) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS accounts (address TEXT PRIMARY KEY, entry TEXT NOT NULL)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def migrate_from_json(self, json_path):
+        # imports a wallet file of the old json format once, in a single transaction
+        if not os.path.isfile(json_path):
+            return
+        with self.lock:
+            if self.conn.execute("SELECT value FROM meta WHERE key = 'migrated_from'").fetchone() is not None:
+                return
+            with open(json_path, "r") as f:
+                data = json.loads(f.read())
+            with self.conn:
+                self.conn.execute("BEGIN")
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO accounts (address, entry) VALUES (?, ?)",
+                    [(address, json.dumps(entry)) for address, entry in data.items()]
+                )
+                self.conn.execute("INSERT INTO meta (key, value) VALUES ('migrated_from', ?)", (json.dumps(json_path),))
+        print("Migrated {} keys from {}".format(len(data), json_path), flush=True)
+
+    def keys(self):
+        with self.lock:
+            return [i[0] for i in self.conn.execute("SELECT address FROM accounts ORDER BY rowid")]
+
+    def __contains__(self, address):
+        with self.lock:
+            return self.conn.execute("SELECT 1 FROM accounts WHERE address = ?", (address,)).fetchone() is not None
+
+    def __getitem__(self, address):
+        with self.lock:
+            row = self.conn.execute("SELECT entry FROM accounts WHERE address = ?", (address,)).fetchone()
+        if row is None:
+            raise KeyError(address)
+        return json.loads(row[0])
+
+    def __setitem__(self, address, entry):
+        self.update({address: entry})
+
+    def update(self, entries):
+        with self.lock:
+            with self.conn:
+                self.conn.execute("BEGIN")
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO accounts (address, entry) VALUES (?, ?)",
+                    [(address, json.dumps(entry)) for address, entry in entries.items()]
+                )
+
+    def get_meta(self, key):
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def set_meta(self, key, value):
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+    def __delitem__(self, address):
+        with self.lock:
+            with self.conn:
+                self.conn.execute("BEGIN")
+                res = self.conn.execute("DELETE FROM accounts WHERE address = ?", (address,))
+        if res.rowcount == 0:
+            raise KeyError(address)
+
+
+def open_keystore(path, backend="sqlite"):
+    if backend == "json":
+        return JsonKeystore(path)
+    keystore = SqliteKeystore("{}.sqlite".format(path))
+    keystore.migrate_from_json(path)
+    return keystore
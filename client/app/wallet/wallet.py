@@ -1,186 +1,369 @@
-from tinyec.ec import SubGroup, Curve
-from Crypto.Random.random import randint
-from web3 import Web3
-from web3.middleware import geth_poa_middleware
-from Crypto.Cipher import AES
-from Crypto.Protocol.KDF import scrypt
-from Crypto.Util.Padding import pad, unpad
-from Crypto.Random import get_random_bytes
-import json, os
-from eth_account import Account
-
-
-# Local wallet helps manage private and public keys
-# keys are stored locally on disk and are encrypted using the password as an encryption key
-# Only users with the password get access to the private keys
-# Private keys should not be allowed to leave the local machine in any circumstance after decrytion
-class EthWallet:
-    p = int("FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2F", 16)
-    n = int("FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141", 16)
-
-    x = int("79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798", 16)
-    y = int("483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8", 16)
-    g = (x,y)
-    h=1
-
-    def __init__(self, data_file) -> None:
-        self.data_file = data_file
-        self.accounts = dict() # keys that are currently decrypted in memory
-        self.w3 = Web3(Web3.HTTPProvider(os.environ.get("ETH_HOST")))
-        self.w3.middleware_onion.inject(geth_poa_middleware, layer=0)
-        try:
-            with open(data_file, "r") as f:
-                self.data = json.loads(f.read())
-        except FileNotFoundError:
-            self.data = dict()
-
-    def get_accounts(self):
-        res = dict()
-        for i in list(self.data.keys()):
-            res[i] = dict()
-            if i in self.accounts:
-                res[i]['state'] = "Unlocked"
-            else:
-                res[i]['state'] = "Locked"
-            res[i]['balance'] = self.get_balance(i)
-        return res
-
-
-    def _generate_key_pair(self):
-        field = SubGroup(self.p, self.g, self.n, self.h)
-        curve = Curve(a = 0, b = 7, field = field, name = 'secp256k1')
-        private_key = randint(1, self.n)
-        public_key = private_key * curve.g
-        public_key_hex = Web3.toHex(public_key.x)[2:] + Web3.toHex(public_key.y)[2:]
-        return public_key_hex, private_key
-
-
-    def _address_from_pub_key(self, public_key_hex):
-        address = Web3.keccak(hexstr = public_key_hex).hex()
-        address = "0x" + address[-40:]
-        address = Web3.toChecksumAddress(address)
-        return address
-
-    def lock_account(self, public_key):
-        res = self.accounts.pop(public_key, None)
-        if res is None:
-            return "Account {} is unknown or already locked".format(public_key)
-        else:
-            return "Successfully locked account {}".format(public_key)
-    
-    def create_new_account(self, password):
-        public_key_hex, private_key = self._generate_key_pair()
-        address = self._address_from_pub_key(public_key_hex)
-        self.accounts[address] = private_key
-        salt, iv, ct = self._encrypt_key_with_password(private_key, password)
-        self.data[address] = {
-            "salt": salt,
-            "iv": iv,
-            "ct": ct
-        }
-
-        self._write_data_to_file()
-        print(f"Created new account")
-        return address, private_key
-
-
-    def upload_account(self, private_key, password):
-        private_key = int(private_key,16)
-        address = Account.from_key(private_key).address
-        self.accounts[address] = private_key
-        salt, iv, ct = self._encrypt_key_with_password(private_key, password)
-        self.data[address] = {
-            "salt": salt,
-            "iv": iv,
-            "ct": ct
-        }
-        self._write_data_to_file()
-
-
-    def delete_account(self, public_key):
-        if public_key not in self.data:
-            return "Unknown account"
-        del self.data[public_key]
-        self.accounts.pop(public_key, None)
-        self._write_data_to_file()
-        return "Successfully deleted key"
-
-    def get_account_by_password(self, key, password):
-        try:
-            private_key = self._decrypt_key_with_password(key, password)
-        except KeyError:
-            return "Key does not exist"
-        except Exception:
-            return "Wrong password"
-        
-        self.accounts[key] = private_key
-        return "Unlocked"
-
-    def get_private_key(self, public_key):
-        try:
-            return Web3.toHex(self.accounts[public_key])
-        except KeyError:
-            if public_key in self.data:
-                return "Key is known but encrypted - Use unlock method and try again"
-            else:
-                return "Unknown key"
-
-    def _encrypt_key_with_password(self, key, password):
-        salt = get_random_bytes(16)
-        enc_key = scrypt(password, salt, 32, N = 2**14, r = 8, p = 1)
-        key = Web3.toHex(key)[2:]
-        data = str(key).encode('utf-8')
-        cipher = AES.new(enc_key, AES.MODE_CBC)
-        ct_bytes = cipher.encrypt(pad(data, AES.block_size))
-        salt = salt.hex()
-        iv = cipher.iv.hex()
-        ct = ct_bytes.hex()
-        return salt, iv, ct
-
-    def _decrypt_key_with_password(self, key, password):
-        data = self.data[key]
-        salt = data['salt']
-        iv = data['iv'] 
-        ct = data['ct']
-        salt = bytes.fromhex(salt)
-        iv = bytes.fromhex(iv)
-        ct = bytes.fromhex(ct)
-
-        enc_key = scrypt(password, salt, 32, N = 2**14, r = 8, p = 1)
-
-        cipher = AES.new(enc_key, AES.MODE_CBC, iv)
-        pt = unpad(cipher.decrypt(ct), AES.block_size).decode('utf-8')
-
-        private_key = int(pt, 16)
-        
-        if Account.from_key(private_key).address != key:
-            raise Exception("Wrong password")
-        return private_key
-
-
-    def _write_data_to_file(self):
-        with open(self.data_file, "w") as f:
-            f.write(json.dumps(self.data))
-
-    def is_unlocked(self, account):
-        return account in self.accounts
-
-    def signTransaction(self, account, transaction):
-        if account not in self.accounts:
-            return "Unknown Account"
-        
-        account = self.w3.eth.account.privateKeyToAccount(self.accounts[account])
-        return account.signTransaction(transaction)
-
-    def create_w3_account(self, account):
-        if account not in self.accounts:
-            return "Unknown Account"
-        return self.w3.eth.account.privateKeyToAccount(self.accounts[account])
-
-    def get_balance(self, account):
-        return self.w3.eth.get_balance(account)
-
-if __name__ == "__main__":
-    wal = EthWallet("/app/wallet/testDB")
-    wal.create_new_account("abcd")
-
+from web3 import Web3
+from web3.middleware import geth_poa_middleware
+import os, threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from eth_account import Account
+from rpc_batch import batch_request
+from wallet.keystore import open_keystore
+from wallet.crypto import encrypt_key_with_password, decrypt_key_with_password, decrypt_keys_with_passwords, new_encrypted_account, new_encrypted_accounts
+from wallet.crypto import new_mnemonic, new_hd_seed, unlock_hd_seed, derive_hd_key
+
+MAX_BATCH_ACCOUNTS = 10000
+WALLET_WORKERS = int(os.environ.get("WALLET_WORKERS", os.cpu_count()))
+# keys (one scrypt run each) allowed to wait for or run on a worker, beyond that
+# requests are turned away as busy
+WALLET_QUEUE_SIZE = int(os.environ.get("WALLET_QUEUE_SIZE", 8 * WALLET_WORKERS))
+# Batches run in jobs of WALLET_CHUNK_SIZE keys and have at most BATCH_JOBS jobs in the
+# pool at a time, so a large batch never holds every worker and single unlocks don't
+# wait behind it
+WALLET_CHUNK_SIZE = int(os.environ.get("WALLET_CHUNK_SIZE", 4))
+BATCH_JOBS = max(1, WALLET_WORKERS // 2)
+
+
+class WalletBusy(Exception):
+    pass
+
+
+class AccountLocked(Exception):
+    pass
+
+
+# Local wallet helps manage private and public keys
+# keys are stored locally on disk and are encrypted using the password as an encryption key
+# Only users with the password get access to the private keys
+# Private keys should not be allowed to leave the local machine in any circumstance after decrytion
+class EthWallet:
+    def __init__(self, data_file) -> None:
+        self.data_file = data_file
+        self.accounts = dict() # keys that are currently decrypted in memory
+        self.signers = dict() # ready to sign LocalAccount objects of unlocked keys
+        # HD wallet - one encrypted seed, accounts are derived from it by index.
+        # While unlocked hd_node holds the parent key that all account keys derive from
+        self.hd_lock = threading.Lock()
+        self.hd_node = None
+        self.hd_derived = set() # HD accounts whose keys were derived since unlocking
+        # worker processes for the slow key derivation (scrypt) and encryption work, so it
+        # never runs in a request thread. They are started right away so they are forked
+        # before the client starts any threads
+        self.pool = ProcessPoolExecutor(max_workers=WALLET_WORKERS)
+        list(self.pool.map(int, range(WALLET_WORKERS)))
+        self.queue_lock = threading.Lock()
+        self.queued = 0 # keys of the jobs submitted to the pool and not finished yet
+        self.w3 = Web3(Web3.HTTPProvider(os.environ.get("ETH_HOST")))
+        self.w3.middleware_onion.inject(geth_poa_middleware, layer=0)
+        self.block_source = None # callable returning the latest known block number
+        self.balance_lock = threading.Lock()
+        self.balance_block = None
+        self.balances = dict() # balances read at balance_block
+        # encrypted keys, each change is committed to the keystore on its own
+        self.data = open_keystore(data_file, os.environ.get("WALLET_BACKEND", "sqlite"))
+
+    def get_accounts(self, with_balance=True, offset=0, limit=None):
+        keys = list(self.data.keys())
+        keys = keys[offset:] if limit is None else keys[offset:offset + limit]
+        if with_balance:
+            balances = self.get_balances(keys)
+        res = dict()
+        for i in keys:
+            res[i] = dict()
+            if self.is_unlocked(i):
+                res[i]['state'] = "Unlocked"
+            else:
+                res[i]['state'] = "Locked"
+            if with_balance:
+                res[i]['balance'] = balances[i]
+        return res
+
+
+    def _reserve(self, count):
+        with self.queue_lock:
+            if self.queued + count > WALLET_QUEUE_SIZE:
+                raise WalletBusy("Wallet is busy, try again later")
+            self.queued += count
+
+    def _release(self, count):
+        with self.queue_lock:
+            self.queued -= count
+
+    def _submit(self, fn, args, keys=1):
+        # keys is the number of scrypt runs of the job, each one takes a queue slot
+        self._reserve(keys)
+        try:
+            future = self.pool.submit(fn, *args)
+        except Exception:
+            self._release(keys)
+            raise
+        future.add_done_callback(lambda future: self._release(keys))
+        return future
+
+    def _run(self, fn, *args):
+        return self._submit(fn, args).result()
+
+    def _run_batch(self, fn, make_args, items):
+        # Runs fn(*make_args(chunk)) over chunks of WALLET_CHUNK_SIZE items, at most
+        # BATCH_JOBS of them at a time. Returns the concatenated results in item order.
+        # A full queue raises WalletBusy at the chunk that doesn't fit
+        size = min(WALLET_CHUNK_SIZE, WALLET_QUEUE_SIZE)
+        results = []
+        running = deque()
+        for start in range(0, len(items), size):
+            if len(running) >= BATCH_JOBS:
+                results.extend(running.popleft().result())
+            chunk = items[start:start + size]
+            running.append(self._submit(fn, make_args(chunk), len(chunk)))
+        for future in running:
+            results.extend(future.result())
+        return results
+
+    def lock_account(self, public_key):
+        if self._hd_index(public_key) is not None:
+            self.lock_hd_wallet()
+            return "Account {} belongs to the HD wallet - locked the HD wallet and all its accounts".format(public_key)
+        self.signers.pop(public_key, None)
+        res = self.accounts.pop(public_key, None)
+        if res is None:
+            return "Account {} is unknown or already locked".format(public_key)
+        else:
+            return "Successfully locked account {}".format(public_key)
+    
+    def create_new_account(self, password):
+        address, private_key, entry = self._run(new_encrypted_account, password)
+        self.accounts[address] = private_key
+        self.data[address] = entry
+
+        print(f"Created new account")
+        return address, private_key
+
+    def create_new_accounts(self, password, count):
+        # Generates and encrypts count new keys in worker processes and stores them
+        # all in a single keystore write. New accounts are unlocked like create_new_account
+        if count < 1 or count > MAX_BATCH_ACCOUNTS:
+            raise ValueError("Count must be between 1 and {}".format(MAX_BATCH_ACCOUNTS))
+        created = self._run_batch(new_encrypted_accounts, lambda chunk: (password, len(chunk)), list(range(count)))
+        self.data.update({address: entry for address, private_key, entry in created})
+        for address, private_key, entry in created:
+            self.accounts[address] = private_key
+        print(f"Created {count} new accounts")
+        return [address for address, private_key, entry in created]
+
+
+    def upload_account(self, private_key, password):
+        private_key = int(private_key,16)
+        address = Account.from_key(private_key).address
+        salt, iv, ct = self._run(encrypt_key_with_password, private_key, password)
+        self.accounts[address] = private_key
+        self.data[address] = {
+            "salt": salt,
+            "iv": iv,
+            "ct": ct
+        }
+
+
+    def delete_account(self, public_key):
+        if public_key not in self.data:
+            return "Unknown account"
+        del self.data[public_key]
+        self.accounts.pop(public_key, None)
+        self.signers.pop(public_key, None)
+        return "Successfully deleted key"
+
+    def get_account_by_password(self, key, password):
+        if self._hd_index(key) is not None:
+            return self.unlock_hd_wallet(password)
+        try:
+            private_key = self._run(decrypt_key_with_password, key, self.data[key], password)
+        except KeyError:
+            return "Key does not exist"
+        except WalletBusy:
+            raise
+        except Exception:
+            return "Wrong password"
+        
+        self.accounts[key] = private_key
+        return "Unlocked"
+
+    def unlock_accounts(self, credentials):
+        # Unlocks many (account, password) pairs, the keys are decrypted in parallel
+        # in the worker pool. Returns a dict of account -> result like get_account_by_password
+        res = dict()
+        jobs = []
+        hd_results = dict() # password -> result, the HD seed is unlocked once per password
+        for key, password in credentials:
+            try:
+                entry = self.data[key]
+            except KeyError:
+                res[key] = "Key does not exist"
+                continue
+            if "hd_index" in entry:
+                if password not in hd_results:
+                    hd_results[password] = self.unlock_hd_wallet(password)
+                res[key] = hd_results[password]
+            else:
+                jobs.append((key, entry, password))
+        private_keys = self._run_batch(decrypt_keys_with_passwords, lambda chunk: (chunk,), jobs)
+        for (key, entry, password), private_key in zip(jobs, private_keys):
+            if private_key is None:
+                res[key] = "Wrong password"
+            else:
+                self.accounts[key] = private_key
+                res[key] = "Unlocked"
+        return res
+
+    def get_private_key(self, public_key):
+        private_key = self._unlocked_key(public_key)
+        if private_key is not None:
+            return Web3.toHex(private_key)
+        else:
+            if public_key in self.data:
+                return "Key is known but encrypted - Use unlock method and try again"
+            else:
+                return "Unknown key"
+
+    def is_unlocked(self, account):
+        return self._unlocked_key(account) is not None
+
+    def _unlocked_key(self, account):
+        # decrypted key of an unlocked account, keys of an unlocked HD wallet are derived on first use
+        private_key = self.accounts.get(account)
+        hd_node = self.hd_node
+        if private_key is None and hd_node is not None:
+            index = self._hd_index(account)
+            if index is not None:
+                private_key = derive_hd_key(hd_node, index)
+                with self.hd_lock:
+                    if self.hd_node is hd_node: # not locked in the meantime
+                        self.accounts[account] = private_key
+                        self.hd_derived.add(account)
+        return private_key
+
+    def _hd_index(self, account):
+        try:
+            return self.data[account].get("hd_index")
+        except KeyError:
+            return None
+
+    def create_hd_wallet(self, password, mnemonic=None):
+        # Creates the HD wallet from a new (or given) mnemonic. The seed is encrypted
+        # with the password once, the mnemonic is returned so it can be backed up
+        with self.hd_lock:
+            if self.data.get_meta("hd_seed") is not None:
+                raise Exception("HD wallet already exists")
+            if mnemonic is None:
+                mnemonic = new_mnemonic()
+            hd_node, salt, iv, ct = self._run(new_hd_seed, password, mnemonic)
+            self.data.set_meta("hd_seed", {
+                "salt": salt,
+                "iv": iv,
+                "ct": ct,
+                "check": Account.from_key(derive_hd_key(hd_node, 0)).address # detects wrong passwords
+            })
+            if self.data.get_meta("hd_next_index") is None:
+                self.data.set_meta("hd_next_index", 0)
+            self.hd_node = hd_node
+        return mnemonic
+
+    def unlock_hd_wallet(self, password):
+        # one scrypt run unlocks every account of the HD wallet
+        record = self.data.get_meta("hd_seed")
+        if record is None:
+            return "No HD wallet - create one first"
+        try:
+            hd_node = self._run(unlock_hd_seed, record, password)
+        except WalletBusy:
+            raise
+        except Exception:
+            return "Wrong password"
+        if Account.from_key(derive_hd_key(hd_node, 0)).address != record["check"]:
+            return "Wrong password"
+        with self.hd_lock:
+            self.hd_node = hd_node
+        return "Unlocked"
+
+    def lock_hd_wallet(self):
+        with self.hd_lock:
+            self.hd_node = None
+            for account in self.hd_derived:
+                self.accounts.pop(account, None)
+                self.signers.pop(account, None)
+            self.hd_derived = set()
+        return "Successfully locked HD wallet"
+
+    def derive_hd_accounts(self, count):
+        # adds the next count accounts of the HD wallet, they are unlocked right away
+        if count < 1 or count > MAX_BATCH_ACCOUNTS:
+            raise ValueError("Count must be between 1 and {}".format(MAX_BATCH_ACCOUNTS))
+        with self.hd_lock:
+            if self.hd_node is None:
+                raise Exception("HD wallet is locked or doesn't exist - unlock it first")
+            start = self.data.get_meta("hd_next_index")
+            derived = dict()
+            for index in range(start, start + count):
+                private_key = derive_hd_key(self.hd_node, index)
+                derived[Account.from_key(private_key).address] = (index, private_key)
+            self.data.update({address: {"hd_index": index} for address, (index, private_key) in derived.items()})
+            self.data.set_meta("hd_next_index", start + count)
+            for address, (index, private_key) in derived.items():
+                self.accounts[address] = private_key
+                self.hd_derived.add(address)
+        return list(derived.keys())
+
+    def signTransaction(self, account, transaction):
+        signer = self.create_w3_account(account)
+        if signer == "Unknown Account":
+            # locked after the caller checked it
+            raise AccountLocked("Account {} is unknown or locked. Try unlocking first".format(account))
+        return signer.signTransaction(transaction)
+
+    def create_w3_account(self, account):
+        # the LocalAccount is derived once per unlock and reused for signing
+        try:
+            return self.signers[account]
+        except KeyError:
+            pass
+        private_key = self._unlocked_key(account)
+        if private_key is None:
+            return "Unknown Account"
+        signer = self.w3.eth.account.privateKeyToAccount(private_key)
+        if account in self.accounts: # could have been locked in the meantime
+            self.signers[account] = signer
+        return signer
+
+    def set_block_source(self, block_source):
+        self.block_source = block_source
+
+    def _latest_block(self):
+        block = self.block_source() if self.block_source is not None else None
+        if block is None:
+            block = self.w3.eth.block_number
+        return block
+
+    def get_balances(self, accounts):
+        # Balances are read in one batch and cached for the block they were read at,
+        # so asking again within the same block doesn't reach the node
+        block = self._latest_block()
+        with self.balance_lock:
+            if self.balance_block != block:
+                self.balance_block = block
+                self.balances = dict()
+            res = {i: self.balances[i] for i in accounts if i in self.balances}
+        missing = [i for i in accounts if i not in res]
+        if len(missing) > 0:
+            results = batch_request([("eth_getBalance", [i, hex(block)]) for i in missing])
+            for account, result in zip(missing, results):
+                res[account] = None if isinstance(result, Exception) else int(result, 16)
+            with self.balance_lock:
+                if self.balance_block == block:
+                    self.balances.update({i: res[i] for i in missing if res[i] is not None})
+        return {i: res[i] for i in accounts}
+
+    def get_balance(self, account):
+        balance = self.get_balances([account])[account]
+        if balance is None:
+            return self.w3.eth.get_balance(account)
+        return balance
+
+if __name__ == "__main__":
+    wal = EthWallet("/app/wallet/testDB")
+    wal.create_new_account("abcd")
+
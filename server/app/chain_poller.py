@@ -0,0 +1,40 @@
+import os
+import threading
+import time
+
+POLL_INTERVAL = float(os.environ.get("CHAIN_POLL_INTERVAL", 5)) # in seconds
+
+
+# Background worker that refreshes the live stats of all active campaigns once per
+# new block, so requests can serve chain state straight from the database.
+# The work per block depends only on the number of active campaigns.
+class ChainPoller(threading.Thread):
+    def __init__(self, db, contract_manager) -> None:
+        super().__init__(daemon=True)
+        self.db = db
+        self.contract_manager = contract_manager
+        self.last_block = None
+
+    def run(self):
+        while True:
+            try:
+                block = self.contract_manager.block_number()
+                if block != self.last_block:
+                    self.refresh(block)
+                    self.last_block = block
+            except Exception as e:
+                print("Chain poller failed: {}".format(str(e)), flush=True)
+            time.sleep(POLL_INTERVAL)
+
+    def refresh(self, block):
+        addresses = self.db.get_active_campaign_addresses()
+        if len(addresses) == 0:
+            return
+        statuses = self.contract_manager.get_fund_statuses(['0x' + i for i in addresses], block)
+        stats = []
+        for address in addresses:
+            status = statuses.get('0x' + address)
+            if status is None:
+                continue # not a live contract anymore, end_fund takes care of it
+            stats.append((address, status["balance"], status["funds_withdrawn"], status["expired"]))
+        self.db.update_live_stats(stats, block)
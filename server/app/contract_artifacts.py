@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import sys
+import time
+
+
+# Compiled contract artifacts (abi + bytecode) are stored on disk keyed by a hash
+# of the contract source and the compiler settings, so solc only runs when the
+# source actually changes. The store is filled at image build time (see Dockerfile)
+# or on first use, and every later start just reads a small json file.
+
+ARTIFACT_DIR = os.environ.get("CONTRACT_ARTIFACT_DIR", "app/contracts/build")
+
+SOLC_SETTINGS = {
+    "outputSelection": { "*": { "*": [ "*" ], "": [ "*" ] } }
+}
+
+
+def source_hash(source, settings=SOLC_SETTINGS):
+    key = json.dumps({"source": source, "settings": settings}, sort_keys=True)
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def _artifact_path(source_file, digest):
+    name = os.path.splitext(os.path.basename(source_file))[0]
+    return os.path.join(ARTIFACT_DIR, "{}-{}.json".format(name, digest))
+
+
+def compile_source(source_file, source):
+    # solc is only needed when there is no cached artifact
+    from solc import compile_standard
+    comp = {
+        "language": "Solidity",
+        "sources": {
+            os.path.basename(source_file): {
+                "content": source
+            },
+        },
+        "settings": SOLC_SETTINGS
+    }
+    compiled_sol = compile_standard(comp)
+    artifacts = dict()
+    for contract_name, contract in compiled_sol['contracts'][os.path.basename(source_file)].items():
+        artifacts[contract_name] = {
+            "abi": json.loads(contract['metadata'])['output']['abi'],
+            "bytecode": contract['evm']['bytecode']['object']
+        }
+    return artifacts
+
+
+def _write_artifacts(path, artifacts):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(tmp_path, "w") as f:
+        f.write(json.dumps(artifacts))
+    os.replace(tmp_path, path) # atomic, concurrent starters never see a partial file
+
+
+def load_artifacts(source_file):
+    with open(source_file, "r") as f:
+        source = f.read()
+    path = _artifact_path(source_file, source_hash(source))
+    try:
+        with open(path, "r") as f:
+            return json.loads(f.read())
+    except (FileNotFoundError, ValueError):
+        pass
+    print("No cached artifact for {} - compiling".format(source_file), flush=True)
+    artifacts = compile_source(source_file, source)
+    try:
+        _write_artifacts(path, artifacts)
+    except OSError as e:
+        print("Failed to store compiled artifact: {}".format(str(e)), flush=True)
+    return artifacts
+
+
+class ContractArtifact:
+    # Lazily loads abi and bytecode of a single contract on first access
+    def __init__(self, source_file, contract_name) -> None:
+        self.source_file = source_file
+        self.contract_name = contract_name
+        self._artifact = None
+
+    def _load(self):
+        if self._artifact is None:
+            self._artifact = load_artifacts(self.source_file)[self.contract_name]
+        return self._artifact
+
+    @property
+    def abi(self):
+        return self._load()["abi"]
+
+    @property
+    def bytecode(self):
+        return self._load()["bytecode"]
+
+
+def benchmark(source_file, rounds=5):
+    with open(source_file, "r") as f:
+        source = f.read()
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        compile_source(source_file, source)
+    compile_time = (time.perf_counter() - start) / rounds
+
+    load_artifacts(source_file) # make sure the cache is warm
+    start = time.perf_counter()
+    for _ in range(rounds):
+        ContractArtifact(source_file, "Fundraiser").abi
+    cached_time = (time.perf_counter() - start) / rounds
+
+    print("compile path: {:.4f}s per start".format(compile_time))
+    print("cached path:  {:.4f}s per start".format(cached_time))
+    print("speedup:      {:.1f}x".format(compile_time / cached_time))
+
+
+if __name__ == "__main__":
+    # python3 app/contract_artifacts.py [--bench] [source files...]
+    args = sys.argv[1:]
+    bench = "--bench" in args
+    sources = [i for i in args if i != "--bench"] or ["app/contracts/fundraiser.sol"]
+    for source_file in sources:
+        if bench:
+            benchmark(source_file)
+        else:
+            load_artifacts(source_file)
+            print("Built artifacts for {}".format(source_file))
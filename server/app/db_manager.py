@@ -1,82 +1,484 @@
-import time
-import os
-from typing import final
-from sqlalchemy import create_engine, text
-from datetime import timedelta, datetime
-
-db_name = os.environ.get('DB_NAME')
-db_user = os.environ.get('DB_USER')
-db_pass = os.environ.get('DB_PASSWORD')
-db_host = os.environ.get('DB_HOST')
-db_port = os.environ.get('DB_PORT')
-
-TABLE = 'fundraisers'
-
-class DB:
-    def __init__(self):
-        db_connection_string = f'postgresql://{db_user}:{db_pass}@{db_host}:{db_port}/{db_name}'
-        self.db = create_engine(db_connection_string)
-        self.create_campaigns_table()
-
-    def create_campaigns_table(self):
-        for _ in range(3):
-            try:
-                with self.db.connect() as conn:
-                    conn.execute(text(f"""CREATE TABLE IF NOT EXISTS {TABLE} (
-                        address CHAR(40) CONSTRAINT firstkey PRIMARY KEY,
-                        name VARCHAR(50) NOT NULL,
-                        description VARCHAR(200),
-                        expires timestamp,
-                        goal NUMERIC(25, 0) NOT NULL,
-                        owner1 CHAR(40) NOT NULL,
-                        owner2 CHAR(40) NOT NULL,
-                        owner3 CHAR(40) NOT NULL,
-                        ended BOOLEAN NOT NULL,
-                        dest_account CHAR(40),
-                        final NUMERIC(25, 0)
-                    )"""))
-                    break
-            except Exception:
-                time.sleep(5)
-
-
-
-    def add_campaign(self, name, description, expires, goal, address, owner1, owner2, owner3):
-        print(f"Adding campaign {name}", flush=True)
-        with self.db.connect() as conn:
-            res = conn.execute(
-            text(f"""INSERT INTO {TABLE} (name, description, expires, goal, address, owner1, owner2, owner3, ended) VALUES (:name, :description, :expires, :goal, :address, :owner1, :owner2, :owner3, :ended)"""),
-             [{"name": name, "description": description, "expires": expires, "goal": goal, "address": address, "owner1": owner1, "owner2": owner2, "owner3": owner3, "ended": False}]
-            )
-        return f"Successfully added campaign {address}"
-
-
-    def get_campaigns(self):
-        print("Getting all campaigns", flush=True)
-        with self.db.connect() as conn:
-            res = conn.execute(
-                text(f"SELECT name, expires, goal::text, address, ended from {TABLE}")
-            )
-            return [dict(zip(["name", "expires", "goal", "address", "ended"], [j.strftime("%d/%m/%Y, %H:%M:%S") if isinstance(j, datetime) else j for j in i])) for i in res]
-
-    def get_campaign_info(self, address):
-        print(f"Getting campaign {address}", flush=True)
-        with self.db.connect() as conn:
-            res = conn.execute(
-                text(f"SELECT address, name, expires, goal::text, description, owner1, owner2, owner3, ended, dest_account, final::text from {TABLE} WHERE address = \'{address}\'")
-            )
-            res = res.all()
-            if len(res) == 0:
-                return {
-                    "result": "Campaign not found"
-                }
-            elif len(res) != 1:
-                return {
-                    "result": "Unkown error"
-                }
-            return [dict(zip(["address", "name", "expires", "goal", "description", "owner1", "owner2", "owner3", "ended", "dest_account", "final"], [j.strftime("%d/%m/%Y, %H:%M:%S") if isinstance(j, datetime) else j for j in i])) for i in res][0]
-
-    def end_campaign(self, address, dest_account, final_balance):
-        print(f"Ending campaign {address}", flush=True)
-        with self.db.connect() as conn:
-            res = conn.execute(f"UPDATE {TABLE} SET ended=True, dest_account=(%s), final=(%s) WHERE address=(%s)",(dest_account, final_balance, address))        
\ No newline at end of file
+import time
+import os
+import json
+import base64
+from typing import final
+from sqlalchemy import create_engine, text
+from datetime import timedelta, datetime
+
+db_name = os.environ.get('DB_NAME')
+db_user = os.environ.get('DB_USER')
+db_pass = os.environ.get('DB_PASSWORD')
+db_host = os.environ.get('DB_HOST')
+db_port = os.environ.get('DB_PORT')
+
+TABLE = 'fundraisers'
+VERIFY_TABLE = 'verifications'
+EVENTS_TABLE = 'donations'
+CHECKPOINT_TABLE = 'indexer_checkpoints'
+
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+LIST_COLUMNS = ["name", "expires", "goal", "address", "ended", "balance", "funds_withdrawn", "expired", "stats_block"]
+# same columns as LIST_COLUMNS, dates are formatted by postgres
+LIST_SELECT = "name, to_char(expires, 'DD/MM/YYYY, HH24:MI:SS'), goal::text, address, ended, balance::text, funds_withdrawn, expired, stats_block"
+INFO_COLUMNS = ["address", "name", "expires", "goal", "description", "owner1", "owner2", "owner3", "ended", "dest_account", "final", "balance", "funds_withdrawn", "expired", "stats_block", "verification", "implementation"]
+INFO_SELECT = "address, name, to_char(expires, 'DD/MM/YYYY, HH24:MI:SS'), goal::text, description, owner1, owner2, owner3, ended, dest_account, final::text, balance::text, funds_withdrawn, expired, stats_block, verification, implementation"
+EVENT_COLUMNS = ["tx_hash", "log_index", "block", "time", "campaign", "event", "account", "amount"]
+EVENT_SELECT = "e.tx_hash, e.log_index, e.block, to_char(e.time, 'DD/MM/YYYY, HH24:MI:SS'), f.address, e.event, e.account, e.amount::text"
+EXPORT_COLUMNS = ["address", "name", "description", "expires", "goal", "owner1", "owner2", "owner3", "ended", "dest_account", "final", "balance", "funds_withdrawn", "expired", "stats_block"]
+EXPORT_SELECT = "address, name, description, to_char(expires, 'DD/MM/YYYY, HH24:MI:SS'), goal::text, owner1, owner2, owner3, ended, dest_account, final::text, balance::text, funds_withdrawn, expired, stats_block"
+EXPORT_FETCH_SIZE = int(os.environ.get("EXPORT_FETCH_SIZE", 2000))
+CHANGE_SEQ = f"{TABLE}_change_seq"
+# advisory lock held by every transaction that takes a change_seq, so changes
+# commit in change_seq order and a reader of the change feed never skips one
+CHANGE_LOCK = 7201
+MAX_CHANGES = 1000
+# text search configuration of the campaign search index
+SEARCH_CONFIG = "english"
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor):
+    return json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+
+
+def campaign_filters(status=None, expires_before=None, expires_after=None, min_goal=None, max_goal=None):
+    # WHERE conditions and their params for the list filters shared by the list endpoints
+    conditions = ["verification = 'verified'"]
+    params = dict()
+    if status == "active":
+        conditions.append("ended = False")
+    elif status == "ended":
+        conditions.append("ended = True")
+    if expires_before is not None:
+        conditions.append("expires < :expires_before")
+        params["expires_before"] = expires_before
+    if expires_after is not None:
+        conditions.append("expires > :expires_after")
+        params["expires_after"] = expires_after
+    if min_goal is not None:
+        conditions.append("goal >= :min_goal")
+        params["min_goal"] = min_goal
+    if max_goal is not None:
+        conditions.append("goal <= :max_goal")
+        params["max_goal"] = max_goal
+    return conditions, params
+
+class DB:
+    def __init__(self):
+        db_connection_string = f'postgresql://{db_user}:{db_pass}@{db_host}:{db_port}/{db_name}'
+        self.db = create_engine(db_connection_string)
+        self.create_campaigns_table()
+
+    def create_campaigns_table(self):
+        for _ in range(3):
+            try:
+                with self.db.connect() as conn:
+                    conn.execute(text(f"""CREATE TABLE IF NOT EXISTS {TABLE} (
+                        address CHAR(40) CONSTRAINT firstkey PRIMARY KEY,
+                        name VARCHAR(50) NOT NULL,
+                        description VARCHAR(200),
+                        expires timestamp,
+                        goal NUMERIC(25, 0) NOT NULL,
+                        owner1 CHAR(40) NOT NULL,
+                        owner2 CHAR(40) NOT NULL,
+                        owner3 CHAR(40) NOT NULL,
+                        ended BOOLEAN NOT NULL,
+                        dest_account CHAR(40),
+                        final NUMERIC(25, 0)
+                    )"""))
+                    # live stats from the blockchain, kept up to date by the chain poller
+                    conn.execute(text(f"""ALTER TABLE {TABLE}
+                        ADD COLUMN IF NOT EXISTS balance NUMERIC(25, 0),
+                        ADD COLUMN IF NOT EXISTS funds_withdrawn BOOLEAN,
+                        ADD COLUMN IF NOT EXISTS expired BOOLEAN,
+                        ADD COLUMN IF NOT EXISTS stats_block BIGINT
+                    """))
+                    # keyset pagination of the campaign list
+                    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {TABLE}_expires_idx ON {TABLE} (expires, address)"))
+                    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {TABLE}_ended_expires_idx ON {TABLE} (ended, expires, address)"))
+                    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {TABLE}_ended_address_idx ON {TABLE} (ended, address)"))
+                    # full text search on name (weighted higher) and description
+                    conn.execute(text(f"""ALTER TABLE {TABLE}
+                        ADD COLUMN IF NOT EXISTS search_doc tsvector GENERATED ALWAYS AS (
+                            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(name, '')), 'A') ||
+                            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')
+                        ) STORED
+                    """))
+                    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {TABLE}_search_idx ON {TABLE} USING GIN (search_doc)"))
+                    # change feed, every change of a campaign gives it a new change_seq
+                    conn.execute(text(f"CREATE SEQUENCE IF NOT EXISTS {CHANGE_SEQ}"))
+                    conn.execute(text(f"ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS change_seq BIGINT NOT NULL DEFAULT nextval('{CHANGE_SEQ}')"))
+                    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {TABLE}_change_seq_idx ON {TABLE} (change_seq)"))
+                    # campaigns are listed once the verifier found their contract on the blockchain,
+                    # goal and expires are read from the contract at that point
+                    conn.execute(text(f"""ALTER TABLE {TABLE}
+                        ALTER COLUMN goal DROP NOT NULL,
+                        ADD COLUMN IF NOT EXISTS verification VARCHAR(10) NOT NULL DEFAULT 'verified'
+                    """))
+                    # implementation of funds that are minimal proxy clones, NULL for full contracts
+                    conn.execute(text(f"ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS implementation CHAR(40)"))
+                    conn.execute(text(f"""CREATE TABLE IF NOT EXISTS {VERIFY_TABLE} (
+                        id BIGSERIAL PRIMARY KEY,
+                        kind VARCHAR(10) NOT NULL,
+                        address CHAR(40) NOT NULL,
+                        dest_account CHAR(40),
+                        final NUMERIC(25, 0),
+                        status VARCHAR(10) NOT NULL DEFAULT 'pending',
+                        reason VARCHAR(200),
+                        requested timestamp NOT NULL DEFAULT now(),
+                        next_check timestamp NOT NULL DEFAULT now(),
+                        checked timestamp
+                    )"""))
+                    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {VERIFY_TABLE}_pending_idx ON {VERIFY_TABLE} (next_check) WHERE status = 'pending'"))
+                    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {VERIFY_TABLE}_address_idx ON {VERIFY_TABLE} (address)"))
+                    # fund events indexed from the blockchain logs
+                    conn.execute(text(f"""CREATE TABLE IF NOT EXISTS {EVENTS_TABLE} (
+                        tx_hash CHAR(66) NOT NULL,
+                        log_index INTEGER NOT NULL,
+                        block BIGINT NOT NULL,
+                        time timestamp,
+                        campaign CHAR(40) NOT NULL,
+                        event VARCHAR(10) NOT NULL,
+                        account CHAR(40) NOT NULL,
+                        amount NUMERIC(25, 0) NOT NULL,
+                        PRIMARY KEY (tx_hash, log_index)
+                    )"""))
+                    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {EVENTS_TABLE}_campaign_idx ON {EVENTS_TABLE} (campaign, block, log_index)"))
+                    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {EVENTS_TABLE}_account_idx ON {EVENTS_TABLE} (account, block, log_index)"))
+                    # event addresses are lower case, campaigns are stored in the case they were
+                    # registered in and matched to their events by lower(address)
+                    conn.execute(text(f"UPDATE {EVENTS_TABLE} SET campaign = lower(campaign), account = lower(account) WHERE campaign <> lower(campaign) OR account <> lower(account)"))
+                    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {TABLE}_address_lower_idx ON {TABLE} (lower(address))"))
+                    conn.execute(text(f"""CREATE TABLE IF NOT EXISTS {CHECKPOINT_TABLE} (
+                        name VARCHAR(50) PRIMARY KEY,
+                        block BIGINT NOT NULL
+                    )"""))
+                    break
+            except Exception:
+                time.sleep(5)
+
+
+
+    def add_campaign(self, name, description, address, owner1, owner2, owner3):
+        # Adds the campaign as pending and queues it for verification. A campaign that
+        # was rejected before can be registered again, any other existing one is kept as is.
+        # Returns the result message and a status of pending or registered
+        print(f"Adding campaign {name}", flush=True)
+        with self.db.begin() as conn:
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": CHANGE_LOCK})
+            res = conn.execute(
+            text(f"""INSERT INTO {TABLE} (name, description, address, owner1, owner2, owner3, ended, verification, change_seq) VALUES (:name, :description, :address, :owner1, :owner2, :owner3, :ended, 'pending', nextval('{CHANGE_SEQ}'))
+                ON CONFLICT (address) DO UPDATE SET name = EXCLUDED.name, description = EXCLUDED.description, owner1 = EXCLUDED.owner1, owner2 = EXCLUDED.owner2, owner3 = EXCLUDED.owner3, verification = 'pending'
+                WHERE {TABLE}.verification = 'rejected'
+                RETURNING address"""),
+             {"name": name, "description": description, "address": address, "owner1": owner1, "owner2": owner2, "owner3": owner3, "ended": False}
+            ).all()
+            if len(res) == 0:
+                return {"result": f"Campaign {address} already registered", "status": "registered"}
+            conn.execute(
+                text(f"INSERT INTO {VERIFY_TABLE} (kind, address) VALUES ('create', :address)"),
+                {"address": address}
+            )
+        return {"result": f"Campaign {address} is pending verification", "status": "pending"}
+
+
+    def get_campaigns(self):
+        print("Getting all campaigns", flush=True)
+        with self.db.connect() as conn:
+            res = conn.execute(
+                text(f"SELECT name, expires, goal::text, address, ended, balance::text, funds_withdrawn, expired, stats_block from {TABLE} WHERE verification = 'verified'")
+            )
+            return [dict(zip(["name", "expires", "goal", "address", "ended", "balance", "funds_withdrawn", "expired", "stats_block"], [j.strftime("%d/%m/%Y, %H:%M:%S") if isinstance(j, datetime) else j for j in i])) for i in res]
+
+    def get_campaigns_page(self, order_by="expires", cursor=None, limit=PAGE_SIZE, **filters):
+        # One page of campaigns ordered by (expires, address) or by address.
+        # The cursor holds the sort key of the last row of the previous page, so every
+        # page is an index range scan no matter how deep into the list it is
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        conditions, params = campaign_filters(**filters)
+        if order_by == "address":
+            sort_columns = ["address"]
+        else:
+            sort_columns = ["expires", "address"]
+            conditions.append("expires IS NOT NULL")
+        if cursor is not None:
+            values = decode_cursor(cursor)
+            if not isinstance(values, list) or len(values) != len(sort_columns) or not all(isinstance(i, str) for i in values):
+                # e.g. a cursor of a page with another order_by
+                raise ValueError("Cursor doesn't match order_by")
+            conditions.append("({}) > ({})".format(", ".join(sort_columns), ", ".join(":cursor{}".format(i) for i in range(len(sort_columns)))))
+            for i, value in enumerate(values):
+                params["cursor{}".format(i)] = datetime.fromisoformat(value) if sort_columns[i] == "expires" else value
+        params["limit"] = limit
+        with self.db.connect() as conn:
+            res = conn.execute(
+                text(f"SELECT {LIST_SELECT}, {', '.join(sort_columns)} from {TABLE} WHERE {' AND '.join(conditions)} ORDER BY {', '.join(sort_columns)} LIMIT :limit"),
+                params
+            ).all()
+        campaigns = [dict(zip(LIST_COLUMNS, i[:len(LIST_COLUMNS)])) for i in res]
+        next_cursor = None
+        if len(res) == limit:
+            last = res[-1][len(LIST_COLUMNS):]
+            next_cursor = encode_cursor([i.isoformat() if isinstance(i, datetime) else i for i in last])
+        return {
+            "campaigns": campaigns,
+            "next_cursor": next_cursor
+        }
+
+    def search_campaigns(self, query, offset=0, limit=PAGE_SIZE, **filters):
+        # Campaigns matching the words of query, best matches first.
+        # Matches are found through the GIN index, so only they are ranked
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        offset = max(0, offset)
+        conditions, params = campaign_filters(**filters)
+        conditions.append("search_doc @@ q")
+        params.update({"query": query, "offset": offset, "limit": limit + 1})
+        with self.db.connect() as conn:
+            res = conn.execute(
+                text(f"""SELECT {LIST_SELECT}, ts_rank(search_doc, q) AS rank
+                    FROM {TABLE}, websearch_to_tsquery('{SEARCH_CONFIG}', :query) AS q
+                    WHERE {" AND ".join(conditions)}
+                    ORDER BY rank DESC, address OFFSET :offset LIMIT :limit"""),
+                params
+            ).all()
+        campaigns = [dict(zip(LIST_COLUMNS + ["rank"], i)) for i in res[:limit]]
+        return {
+            "campaigns": campaigns,
+            "next_offset": offset + limit if len(res) > limit else None
+        }
+
+    def export_campaigns(self, fetch_size=EXPORT_FETCH_SIZE):
+        # Generator of lists of rows over the whole table. The rows are read through a
+        # server side cursor fetch_size at a time, so memory doesn't grow with the table
+        print("Exporting all campaigns", flush=True)
+        with self.db.connect() as conn:
+            res = conn.execution_options(stream_results=True).execute(
+                text(f"SELECT {EXPORT_SELECT} from {TABLE} WHERE verification = 'verified' ORDER BY address")
+            )
+            while True:
+                rows = res.fetchmany(fetch_size)
+                if len(rows) == 0:
+                    break
+                yield [tuple(i) for i in rows]
+
+    def get_changes(self, since=0, limit=MAX_CHANGES):
+        # Campaigns changed after change_seq since, in change order. A reader keeps the
+        # last change_seq it saw and passes it as since to get only newer changes
+        limit = max(1, min(limit, MAX_CHANGES))
+        with self.db.connect() as conn:
+            res = conn.execute(
+                text(f"SELECT {LIST_SELECT}, change_seq from {TABLE} WHERE change_seq > :since AND verification = 'verified' ORDER BY change_seq LIMIT :limit"),
+                {"since": since, "limit": limit}
+            ).all()
+        return {
+            "changes": [dict(zip(LIST_COLUMNS + ["change_seq"], i)) for i in res],
+            "last_seq": res[-1][-1] if len(res) > 0 else since,
+            "more": len(res) == limit
+        }
+
+    def get_campaign_info(self, address):
+        print(f"Getting campaign {address}", flush=True)
+        with self.db.connect() as conn:
+            res = conn.execute(
+                text(f"SELECT {INFO_SELECT} from {TABLE} WHERE address = :address"),
+                {"address": address}
+            )
+            res = res.all()
+            if len(res) == 0:
+                return {
+                    "result": "Campaign not found"
+                }
+            elif len(res) != 1:
+                return {
+                    "result": "Unkown error"
+                }
+            return dict(zip(INFO_COLUMNS, res[0]))
+
+    def get_campaigns_info(self, addresses):
+        # info of many campaigns in one query, campaigns that aren't found are left out
+        print(f"Getting {len(addresses)} campaigns", flush=True)
+        with self.db.connect() as conn:
+            res = conn.execute(
+                text(f"SELECT {INFO_SELECT} from {TABLE} WHERE address = ANY(CAST(:addresses AS char(40)[]))"),
+                {"addresses": list(addresses)}
+            )
+            return [dict(zip(INFO_COLUMNS, i)) for i in res]
+
+    def get_active_campaign_addresses(self):
+        with self.db.connect() as conn:
+            res = conn.execute(
+                text(f"SELECT address from {TABLE} WHERE ended = False AND verification = 'verified'")
+            )
+            return [i[0] for i in res]
+
+    def update_live_stats(self, stats, block):
+        # stats is a list of (address, balance, funds_withdrawn, expired) tuples.
+        # All rows are written with a single UPDATE joined against unnested arrays
+        if len(stats) == 0:
+            return
+        # Only rows whose stats actually changed get a new change_seq
+        addresses, balances, withdrawn, expired = (list(i) for i in zip(*stats))
+        with self.db.begin() as conn:
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": CHANGE_LOCK})
+            conn.execute(
+                text(f"""UPDATE {TABLE} SET balance = s.balance, funds_withdrawn = s.funds_withdrawn, expired = s.expired, stats_block = :block,
+                        change_seq = CASE WHEN ({TABLE}.balance, {TABLE}.funds_withdrawn, {TABLE}.expired) IS DISTINCT FROM (s.balance, s.funds_withdrawn, s.expired)
+                                          THEN nextval('{CHANGE_SEQ}') ELSE {TABLE}.change_seq END
+                    FROM (SELECT unnest(CAST(:addresses AS text[])) AS address,
+                                 unnest(CAST(:balances AS numeric[])) AS balance,
+                                 unnest(CAST(:withdrawn AS boolean[])) AS funds_withdrawn,
+                                 unnest(CAST(:expired AS boolean[])) AS expired) AS s
+                    WHERE {TABLE}.address = s.address"""),
+                {"addresses": addresses, "balances": balances, "withdrawn": withdrawn, "expired": expired, "block": block}
+            )
+
+    def end_campaign(self, address, dest_account, final_balance):
+        # queues the end of the campaign for verification, unless one is already pending
+        print(f"Ending campaign {address}", flush=True)
+        with self.db.begin() as conn:
+            conn.execute(
+                text(f"""INSERT INTO {VERIFY_TABLE} (kind, address, dest_account, final)
+                    SELECT 'end', :address, :dest_account, :final
+                    WHERE NOT EXISTS (SELECT 1 FROM {VERIFY_TABLE} WHERE kind = 'end' AND address = :address AND status = 'pending')"""),
+                {"dest_account": dest_account, "final": final_balance, "address": address}
+            )
+
+    def claim_verifications(self, limit, lease):
+        # Takes up to limit due verifications. They are not due again for lease seconds,
+        # so a verification that stays pending (or whose verifier died) is retried after that
+        with self.db.begin() as conn:
+            res = conn.execute(
+                text(f"""UPDATE {VERIFY_TABLE} SET next_check = now() + make_interval(secs => :lease)
+                    WHERE id IN (SELECT id FROM {VERIFY_TABLE} WHERE status = 'pending' AND next_check <= now()
+                                 ORDER BY next_check LIMIT :limit FOR UPDATE SKIP LOCKED)
+                    RETURNING id, kind, address, dest_account, final::text, extract(epoch from now() - requested)"""),
+                {"limit": limit, "lease": lease}
+            )
+            return [dict(zip(["id", "kind", "address", "dest_account", "final", "age"], i)) for i in res]
+
+    def complete_verifications(self, created, ended, rejected_creates, results):
+        # Applies the results of a batch of verifications in one transaction.
+        # created - (address, goal, expires, implementation) of contracts that were found
+        # ended - (id, address, dest_account, final) of end verifications of contracts that
+        #   are gone, they are verified here if the campaign was found and ended
+        # rejected_creates - addresses of campaigns without a contract
+        # results - (id, status, reason) of every other finished verification
+        results = list(results)
+        with self.db.begin() as conn:
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": CHANGE_LOCK})
+            if len(created) > 0:
+                addresses, goals, expires, implementations = (list(i) for i in zip(*created))
+                conn.execute(
+                    text(f"""UPDATE {TABLE} SET goal = s.goal, expires = s.expires, implementation = s.implementation, verification = 'verified', change_seq = nextval('{CHANGE_SEQ}')
+                        FROM (SELECT unnest(CAST(:addresses AS char(40)[])) AS address,
+                                     unnest(CAST(:goals AS numeric[])) AS goal,
+                                     unnest(CAST(:expires AS timestamp[])) AS expires,
+                                     unnest(CAST(:implementations AS char(40)[])) AS implementation) AS s
+                        WHERE {TABLE}.address = s.address AND {TABLE}.verification = 'pending'"""),
+                    {"addresses": addresses, "goals": goals, "expires": expires, "implementations": implementations}
+                )
+            if len(ended) > 0:
+                ids, addresses, dest_accounts, finals = (list(i) for i in zip(*ended))
+                updated = set(i[0] for i in conn.execute(
+                    text(f"""UPDATE {TABLE} SET ended = True, dest_account = s.dest_account, final = s.final, change_seq = nextval('{CHANGE_SEQ}')
+                        FROM (SELECT unnest(CAST(:addresses AS char(40)[])) AS address,
+                                     unnest(CAST(:dest_accounts AS char(40)[])) AS dest_account,
+                                     unnest(CAST(:finals AS numeric[])) AS final) AS s
+                        WHERE {TABLE}.address = s.address
+                        RETURNING {TABLE}.address"""),
+                    {"addresses": addresses, "dest_accounts": dest_accounts, "finals": finals}
+                ).all())
+                for verification_id, address in zip(ids, addresses):
+                    if address in updated:
+                        results.append((verification_id, "verified", None))
+                    else:
+                        results.append((verification_id, "rejected", "Campaign not found"))
+            if len(rejected_creates) > 0:
+                conn.execute(
+                    text(f"UPDATE {TABLE} SET verification = 'rejected' WHERE address = ANY(CAST(:addresses AS char(40)[])) AND verification = 'pending'"),
+                    {"addresses": list(rejected_creates)}
+                )
+            if len(results) > 0:
+                ids, statuses, reasons = (list(i) for i in zip(*results))
+                conn.execute(
+                    text(f"""UPDATE {VERIFY_TABLE} SET status = s.status, reason = s.reason, checked = now()
+                        FROM (SELECT unnest(CAST(:ids AS bigint[])) AS id,
+                                     unnest(CAST(:statuses AS text[])) AS status,
+                                     unnest(CAST(:reasons AS text[])) AS reason) AS s
+                        WHERE {VERIFY_TABLE}.id = s.id"""),
+                    {"ids": ids, "statuses": statuses, "reasons": reasons}
+                )
+
+    def get_checkpoint(self, name):
+        # last block processed by the indexer called name, None if it never ran
+        with self.db.connect() as conn:
+            res = conn.execute(text(f"SELECT block FROM {CHECKPOINT_TABLE} WHERE name = :name"), {"name": name}).all()
+        return res[0][0] if len(res) > 0 else None
+
+    def add_fund_events(self, events, block_times, name, block):
+        # Stores the events of a block range and moves the checkpoint of the indexer to
+        # the end of the range in the same transaction. Events that are already stored
+        # (a range that is indexed again after a restart) are skipped. Events of every
+        # contract are stored, a campaign can be registered after its blocks are indexed,
+        # and get_fund_events only returns the ones of listed campaigns
+        with self.db.begin() as conn:
+            if len(events) > 0:
+                tx_hashes, log_indexes, blocks, campaigns, kinds, accounts, amounts = (list(i) for i in zip(*events))
+                conn.execute(
+                    text(f"""INSERT INTO {EVENTS_TABLE} (tx_hash, log_index, block, time, campaign, event, account, amount)
+                        SELECT * FROM unnest(CAST(:tx_hashes AS char(66)[]), CAST(:log_indexes AS integer[]), CAST(:blocks AS bigint[]),
+                                             CAST(:times AS timestamp[]), CAST(:campaigns AS char(40)[]), CAST(:kinds AS text[]),
+                                             CAST(:accounts AS char(40)[]), CAST(:amounts AS numeric[]))
+                        ON CONFLICT DO NOTHING"""),
+                    {"tx_hashes": tx_hashes, "log_indexes": log_indexes, "blocks": blocks, "times": [block_times.get(i) for i in blocks],
+                     "campaigns": campaigns, "kinds": kinds, "accounts": accounts, "amounts": amounts}
+                )
+            conn.execute(
+                text(f"INSERT INTO {CHECKPOINT_TABLE} (name, block) VALUES (:name, :block) ON CONFLICT (name) DO UPDATE SET block = EXCLUDED.block"),
+                {"name": name, "block": block}
+            )
+
+    def get_fund_events(self, campaign=None, account=None, cursor=None, limit=PAGE_SIZE):
+        # Events of a campaign or of an account, newest first, only of listed campaigns.
+        # Paged by keyset like the campaign list
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        conditions = ["f.verification = 'verified'"]
+        params = {"limit": limit}
+        if campaign is not None:
+            conditions.append("e.campaign = :campaign")
+            params["campaign"] = campaign.lower()
+        if account is not None:
+            conditions.append("e.account = :account")
+            params["account"] = account.lower()
+        if cursor is not None:
+            values = decode_cursor(cursor)
+            if not isinstance(values, list) or len(values) != 2 or not all(type(i) is int and 0 <= i < 2**63 for i in values):
+                # the (block, log_index) of the last event of the previous page
+                raise ValueError("Invalid cursor")
+            params["cursor_block"], params["cursor_index"] = values
+            conditions.append("(e.block, e.log_index) < (:cursor_block, :cursor_index)")
+        with self.db.connect() as conn:
+            res = conn.execute(
+                text(f"""SELECT {EVENT_SELECT} FROM {EVENTS_TABLE} e JOIN {TABLE} f ON lower(f.address) = e.campaign
+                    WHERE {" AND ".join(conditions)} ORDER BY e.block DESC, e.log_index DESC LIMIT :limit"""),
+                params
+            ).all()
+        events = [dict(zip(EVENT_COLUMNS, i)) for i in res]
+        return {
+            "events": events,
+            "next_cursor": encode_cursor([res[-1][2], res[-1][1]]) if len(res) == limit else None
+        }
+
+    def get_verifications(self, address):
+        with self.db.connect() as conn:
+            res = conn.execute(
+                text(f"""SELECT kind, status, reason, to_char(requested, 'DD/MM/YYYY, HH24:MI:SS'), to_char(checked, 'DD/MM/YYYY, HH24:MI:SS')
+                    FROM {VERIFY_TABLE} WHERE address = :address ORDER BY id"""),
+                {"address": address}
+            )
+            return [dict(zip(["kind", "status", "reason", "requested", "checked"], i)) for i in res]        
\ No newline at end of file
@@ -0,0 +1,62 @@
+import os
+import threading
+import time
+
+INDEXER_INTERVAL = float(os.environ.get("INDEXER_INTERVAL", 5)) # in seconds
+INDEXER_CONFIRMATIONS = int(os.environ.get("INDEXER_CONFIRMATIONS", 6)) # blocks
+# first block to index, e.g. the block the first campaign was created at. Without it
+# a new server starts at the current block instead of scanning the whole chain
+INDEXER_START_BLOCK = int(os.environ["INDEXER_START_BLOCK"]) if os.environ.get("INDEXER_START_BLOCK") else None
+INDEXER_CHUNK = int(os.environ.get("INDEXER_CHUNK", 1000)) # blocks per eth_getLogs to start with
+INDEXER_MAX_CHUNK = int(os.environ.get("INDEXER_MAX_CHUNK", 20000))
+
+CHECKPOINT = "fund_events"
+
+
+# Background worker that copies the Funded, Refunded and Withdrawn events of all funds
+# into the database, so donation history is served without asking the node.
+# Logs are read with eth_getLogs over block ranges. A range that fails (too many
+# results or a timeout on the node) is halved and the range grows again after each
+# success. Only blocks INDEXER_CONFIRMATIONS deep are indexed, so a reorg shorter
+# than that never reaches the database. The last indexed block is checkpointed with
+# the events of its range, so a restart continues where it stopped. Events of
+# contracts that aren't registered campaigns are left out.
+class LogIndexer(threading.Thread):
+    def __init__(self, db, contract_manager) -> None:
+        super().__init__(daemon=True)
+        self.db = db
+        self.contract_manager = contract_manager
+        self.chunk = INDEXER_CHUNK
+
+    def run(self):
+        while True:
+            try:
+                self.catch_up()
+            except Exception as e:
+                print("Log indexer failed: {}".format(str(e)), flush=True)
+            time.sleep(INDEXER_INTERVAL)
+
+    def catch_up(self):
+        last = self.db.get_checkpoint(CHECKPOINT)
+        target = self.contract_manager.block_number() - INDEXER_CONFIRMATIONS
+        if last is None and INDEXER_START_BLOCK is None:
+            print("INDEXER_START_BLOCK is not set, indexing fund events from block {}".format(target + 1), flush=True)
+            self.db.add_fund_events([], dict(), CHECKPOINT, target)
+            return
+        start = INDEXER_START_BLOCK if last is None else last + 1
+        while start <= target:
+            end = min(start + self.chunk - 1, target)
+            try:
+                events = self.contract_manager.get_fund_events(start, end)
+            except Exception as e:
+                if self.chunk == 1:
+                    raise
+                self.chunk = max(1, self.chunk // 2)
+                print("Log range {}-{} failed ({}), trying {} blocks".format(start, end, str(e), self.chunk), flush=True)
+                continue
+            block_times = self.contract_manager.get_block_times(set(i[2] for i in events)) if len(events) > 0 else dict()
+            self.db.add_fund_events(events, block_times, CHECKPOINT, end)
+            if len(events) > 0:
+                print("Indexed {} fund events in blocks {}-{}".format(len(events), start, end), flush=True)
+            self.chunk = min(self.chunk * 2, INDEXER_MAX_CHUNK)
+            start = end + 1
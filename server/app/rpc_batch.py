@@ -0,0 +1,47 @@
+import os
+import requests
+
+# Sends many JSON-RPC calls to the ethereum node in a few http requests instead of
+# one round trip per call. Results come back in the same order as the calls, a
+# failed call is returned as an RPCError instead of raising so one bad address
+# doesn't fail the whole batch.
+
+ETH_HOST = os.environ.get("ETH_HOST")
+RPC_BATCH_SIZE = int(os.environ.get("RPC_BATCH_SIZE", 500))
+RPC_TIMEOUT = int(os.environ.get("RPC_TIMEOUT", 30)) # in seconds
+
+session = requests.Session()
+
+
+class RPCError(Exception):
+    def __init__(self, message, data=None) -> None:
+        super().__init__(message)
+        # error data of the call, e.g. the revert data of a failed eth_call
+        self.data = data
+
+
+def batch_request(calls, batch_size=RPC_BATCH_SIZE):
+    # calls is a list of (method, params) tuples
+    results = []
+    for start in range(0, len(calls), batch_size):
+        chunk = calls[start:start + batch_size]
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(chunk)
+        ]
+        response = session.post(ETH_HOST, json=payload, timeout=RPC_TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
+        if not isinstance(data, list):
+            # nodes that don't support batches answer with a single error object
+            raise RPCError(data.get("error", {}).get("message", "Batch requests are not supported"))
+        by_id = {i.get("id"): i for i in data}
+        for i in range(len(chunk)):
+            item = by_id.get(i)
+            if item is None:
+                results.append(RPCError("No response for call"))
+            elif "error" in item:
+                results.append(RPCError(item["error"].get("message"), item["error"].get("data")))
+            else:
+                results.append(item.get("result"))
+    return results
@@ -1,130 +1,312 @@
-from flask import Flask, request, json, jsonify
-from flask_swagger_ui import get_swaggerui_blueprint
-from datetime import datetime
-from server_contract_manager import ServerContractManager
-from db_manager import DB
-
-contract_manager = ServerContractManager()
-
-app = Flask(__name__)
-
-db = DB()
-
-def verify_public_key_syntax(public_key):
-    if public_key is None:
-        return None
-    if public_key.startswith('0x') and len(public_key) == 42:
-        int(public_key[2:], 16) # check valid byte string
-        return public_key
-    elif public_key.startswith('0X') and len(public_key) == 42:
-        int(public_key[2:], 16) # check valid byte string
-        return public_key.replace("0X", '0x')
-    elif len(public_key) == 40:
-        int(public_key, 16) # check valid byte string
-        return '0x' + public_key
-    else:
-        return None
-
-
-
-@app.route("/api/campaign/list", methods=["GET"])
-def get_campaigns():
-    return jsonify(db.get_campaigns())
-
-@app.route("/api/campaign/info", methods=["GET"])
-def get_campaign_info():
-    try:
-        fundAddress = verify_public_key_syntax(request.args.get('address'))[2:]
-    except (ValueError, TypeError):
-        return jsonify({
-            "result": "Missing or invalid Fund Address"
-        })
-    if fundAddress is None:
-        return jsonify({
-            "result": "Missing or invalid Fund Address"
-        })
-    res = db.get_campaign_info(fundAddress)
-    return jsonify(res)
-
-
-@app.route("/api/campaign/create", methods=["POST"])
-def create_campagin():
-    try:
-        owner1 = verify_public_key_syntax(request.args.get('owner1'))[2:]
-        owner2 = verify_public_key_syntax(request.args.get('owner2'))[2:]
-        owner3 = verify_public_key_syntax(request.args.get('owner3'))[2:]
-    except (ValueError, TypeError):
-        return jsonify({
-            "result": "Params owner1, owner2 and owner3 not included or invalid"
-        })
-    try:
-        address = verify_public_key_syntax(request.args.get('address'))[2:]
-    except (ValueError, TypeError):
-        return jsonify({
-            "result": "Params must include a valid address"
-        })
-    try:
-        name = request.args.get("name")
-        description = request.args.get("description")
-    except ValueError:
-        return jsonify({
-            "result": "Missing required params name or description"
-        })
-
-    # need to read goal and expires from block chain and verify other parameters.
-    try:
-        data_from_blockchain = contract_manager.get_fund_status('0x' + address)
-    except Exception as e:
-        print(str(e), flush=True)
-        return jsonify({
-            "result": "fail",
-            "reason": str(e)
-        })
-    expires = data_from_blockchain["expires"]
-    goal = data_from_blockchain["goal"]
-    res = db.add_campaign(name, description, expires, goal, address, owner1, owner2, owner3)
-    return jsonify({
-        "result": res
-    })
-
-@app.route("/api/campaign/end", methods=["POST"])
-def end_fund():
-    try:
-        dest_account = verify_public_key_syntax(request.args.get('dest_account'))[2:]
-    except (ValueError, TypeError):
-        return jsonify({
-            "result": "Param dest_account not included or invalid"
-        })
-    try:
-        dest_account = verify_public_key_syntax(request.args.get('address'))[2:]
-    except (ValueError, TypeError):
-        return jsonify({
-            "result": "Param dest_account not included or invalid"
-        })
-    try:
-        final_balance = int(request.args.get("final_balance"))
-        address =  verify_public_key_syntax(request.args.get("address"))[2:]
-    except ValueError:
-        return jsonify({
-            "result": "Missing required params address or final_balance"
-        })
-
-    # Verify contract has been withdrawan expect to except
-    try:
-        data_from_blockchain = contract_manager.get_fund_status('0x' + address)
-        return jsonify({
-            "result": "fail",
-            "reason": "Contract is still active"
-        })
-    except Exception as e:
-        # This means the contract really doens't exist
-        print("Ending Fund {}".format(address), flush=True)
-        db.end_campaign(address, dest_account, final_balance)
-    
-    return jsonify({
-        "result": "success"
-    })
-
-if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=80, debug=False)
-
+from flask import Flask, Response, request, json, jsonify, stream_with_context
+from flask_swagger_ui import get_swaggerui_blueprint
+from datetime import datetime
+from server_contract_manager import ServerContractManager
+from db_manager import DB, EXPORT_COLUMNS
+from chain_poller import ChainPoller
+from verifier import Verifier
+from log_indexer import LogIndexer
+from web3 import Web3
+import csv
+import io
+import os
+
+contract_manager = ServerContractManager()
+
+app = Flask(__name__)
+
+db = DB()
+
+if os.environ.get("CHAIN_POLLER", "true").lower() == "true":
+    ChainPoller(db, contract_manager).start()
+
+verifier = Verifier(db, contract_manager)
+verifier.start()
+
+if os.environ.get("LOG_INDEXER", "true").lower() == "true":
+    LogIndexer(db, contract_manager).start()
+
+def verify_public_key_syntax(public_key):
+    if public_key is None:
+        return None
+    if public_key.startswith('0x') and len(public_key) == 42:
+        int(public_key[2:], 16) # check valid byte string
+        return public_key
+    elif public_key.startswith('0X') and len(public_key) == 42:
+        int(public_key[2:], 16) # check valid byte string
+        return public_key.replace("0X", '0x')
+    elif len(public_key) == 40:
+        int(public_key, 16) # check valid byte string
+        return '0x' + public_key
+    else:
+        return None
+
+
+
+def parse_date(value):
+    if value is None:
+        return None
+    try:
+        return datetime.strptime(value, "%Y/%m/%d, %H:%M:%S")
+    except ValueError:
+        return datetime.fromisoformat(value)
+
+def get_list_filters():
+    # filters shared by the campaign list endpoints
+    min_goal = request.args.get("min_goal")
+    max_goal = request.args.get("max_goal")
+    return {
+        "status": request.args.get("status"),
+        "expires_before": parse_date(request.args.get("expires_before")),
+        "expires_after": parse_date(request.args.get("expires_after")),
+        "min_goal": int(min_goal) if min_goal is not None else None,
+        "max_goal": int(max_goal) if max_goal is not None else None
+    }
+
+PAGE_ARGS = ["limit", "cursor", "order_by", "status", "expires_before", "expires_after", "min_goal", "max_goal"]
+
+@app.route("/api/campaign/list", methods=["GET"])
+def get_campaigns():
+    if not any(i in request.args for i in PAGE_ARGS):
+        # no paging asked for, the whole list like before
+        return jsonify(db.get_campaigns())
+    try:
+        filters = get_list_filters()
+        limit = int(request.args.get("limit", 100))
+    except (ValueError, TypeError):
+        return jsonify({
+            "result": "fail",
+            "reason": "Invalid paging or filter params"
+        })
+    try:
+        res = db.get_campaigns_page(order_by=request.args.get("order_by", "expires"), cursor=request.args.get("cursor"), limit=limit, **filters)
+    except (ValueError, TypeError, IndexError):
+        return jsonify({
+            "result": "fail",
+            "reason": "Invalid cursor"
+        })
+    return jsonify(res)
+
+@app.route("/api/campaign/search", methods=["GET"])
+def search_campaigns():
+    query = request.args.get("q")
+    if query is None or len(query.strip()) == 0:
+        return jsonify({
+            "result": "fail",
+            "reason": "Param q not included"
+        })
+    try:
+        filters = get_list_filters()
+        offset = int(request.args.get("offset", 0))
+        limit = int(request.args.get("limit", 100))
+    except (ValueError, TypeError):
+        return jsonify({
+            "result": "fail",
+            "reason": "Invalid paging or filter params"
+        })
+    return jsonify(db.search_campaigns(query.strip(), offset=offset, limit=limit, **filters))
+
+def export_ndjson(chunks):
+    for rows in chunks:
+        yield "".join(json.dumps(dict(zip(EXPORT_COLUMNS, i))) + "\n" for i in rows)
+
+def export_csv(chunks):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in chunks:
+        writer.writerows(rows)
+        yield out.getvalue()
+        out.seek(0)
+        out.truncate()
+    if out.tell() > 0: # header of an empty table
+        yield out.getvalue()
+
+@app.route("/api/campaign/export", methods=["GET"])
+def export_campaigns():
+    # The response is streamed (chunked) as the rows are read, one chunk per fetch
+    export_format = request.args.get("format", "ndjson")
+    if export_format == "csv":
+        body, mimetype = export_csv(db.export_campaigns()), "text/csv"
+    elif export_format == "ndjson":
+        body, mimetype = export_ndjson(db.export_campaigns()), "application/x-ndjson"
+    else:
+        return jsonify({
+            "result": "fail",
+            "reason": "Param format must be ndjson or csv"
+        })
+    return Response(stream_with_context(body), mimetype=mimetype, headers={
+        "Content-Disposition": f"attachment; filename=campaigns.{export_format}"
+    })
+
+@app.route("/api/campaign/changes", methods=["GET"])
+def get_changes():
+    try:
+        since = int(request.args.get("since", 0))
+        limit = int(request.args.get("limit", 1000))
+    except ValueError:
+        return jsonify({
+            "result": "fail",
+            "reason": "Params since and limit must be integers"
+        })
+    return jsonify(db.get_changes(since, limit))
+
+@app.route("/api/campaign/info", methods=["GET"])
+def get_campaign_info():
+    try:
+        fundAddress = verify_public_key_syntax(request.args.get('address'))[2:]
+    except (ValueError, TypeError):
+        return jsonify({
+            "result": "Missing or invalid Fund Address"
+        })
+    if fundAddress is None:
+        return jsonify({
+            "result": "Missing or invalid Fund Address"
+        })
+    res = db.get_campaign_info(fundAddress)
+    return jsonify(res)
+
+MAX_INFO_BATCH = 500
+
+@app.route("/api/campaign/info_batch", methods=["GET", "POST"])
+def get_campaigns_info():
+    # addresses are either a json list in the body or a comma separated "addresses" param
+    if request.method == "POST":
+        addresses = (request.get_json(silent=True) or dict()).get("addresses")
+    else:
+        addresses = request.args.get("addresses")
+        addresses = addresses.split(",") if addresses is not None else None
+    if not isinstance(addresses, list) or len(addresses) == 0 or len(addresses) > MAX_INFO_BATCH:
+        return jsonify({
+            "result": f"Param addresses must have between 1 and {MAX_INFO_BATCH} addresses"
+        })
+    try:
+        fund_addresses = [verify_public_key_syntax(str(i).strip())[2:] for i in addresses]
+    except (ValueError, TypeError):
+        return jsonify({
+            "result": "Missing or invalid Fund Address"
+        })
+    campaigns = db.get_campaigns_info(set(fund_addresses))
+    found = set(i["address"] for i in campaigns)
+    return jsonify({
+        "campaigns": campaigns,
+        "not_found": [i for i in dict.fromkeys(fund_addresses) if i not in found]
+    })
+
+@app.route("/api/campaign/create", methods=["POST"])
+def create_campagin():
+    try:
+        owner1 = verify_public_key_syntax(request.args.get('owner1'))[2:]
+        owner2 = verify_public_key_syntax(request.args.get('owner2'))[2:]
+        owner3 = verify_public_key_syntax(request.args.get('owner3'))[2:]
+    except (ValueError, TypeError):
+        return jsonify({
+            "status": "invalid",
+            "result": "Params owner1, owner2 and owner3 not included or invalid"
+        })
+    try:
+        address = verify_public_key_syntax(request.args.get('address'))[2:]
+    except (ValueError, TypeError):
+        return jsonify({
+            "status": "invalid",
+            "result": "Params must include a valid address"
+        })
+    try:
+        name = request.args.get("name")
+        description = request.args.get("description")
+    except ValueError:
+        return jsonify({
+            "status": "invalid",
+            "result": "Missing required params name or description"
+        })
+
+    # goal and expires are read from the blockchain by the verifier
+    res = db.add_campaign(name, description, address, owner1, owner2, owner3)
+    verifier.notify()
+    return jsonify(res)
+
+@app.route("/api/campaign/end", methods=["POST"])
+def end_fund():
+    try:
+        dest_account = verify_public_key_syntax(request.args.get('dest_account'))[2:]
+    except (ValueError, TypeError):
+        return jsonify({
+            "status": "invalid",
+            "result": "Param dest_account not included or invalid"
+        })
+    try:
+        dest_account = verify_public_key_syntax(request.args.get('address'))[2:]
+    except (ValueError, TypeError):
+        return jsonify({
+            "status": "invalid",
+            "result": "Param dest_account not included or invalid"
+        })
+    try:
+        final_balance = int(request.args.get("final_balance"))
+        address =  verify_public_key_syntax(request.args.get("address"))[2:]
+    except (ValueError, TypeError):
+        return jsonify({
+            "status": "invalid",
+            "result": "Missing required params address or final_balance"
+        })
+
+    # the verifier checks that the contract has been withdrawn before ending the fund
+    db.end_campaign(address, dest_account, final_balance)
+    verifier.notify()
+    return jsonify({
+        "result": "pending",
+        "status": "pending"
+    })
+
+def get_events(campaign=None, account=None):
+    try:
+        limit = int(request.args.get("limit", 100))
+    except (ValueError, TypeError):
+        return jsonify({
+            "result": "fail",
+            "reason": "Invalid limit"
+        })
+    try:
+        res = db.get_fund_events(campaign=campaign, account=account, cursor=request.args.get("cursor"), limit=limit)
+    except (ValueError, TypeError, IndexError):
+        return jsonify({
+            "result": "fail",
+            "reason": "Invalid cursor"
+        })
+    return jsonify(res)
+
+@app.route("/api/campaign/events", methods=["GET"])
+def get_campaign_events():
+    # Funded, Refunded and Withdrawn events of a campaign, newest first
+    try:
+        fundAddress = Web3.toChecksumAddress(verify_public_key_syntax(request.args.get('address')))[2:]
+    except (ValueError, TypeError):
+        return jsonify({
+            "result": "Missing or invalid Fund Address"
+        })
+    return get_events(campaign=fundAddress)
+
+@app.route("/api/account/events", methods=["GET"])
+def get_account_events():
+    # donations, refunds and withdrawals of an account in all campaigns, newest first
+    try:
+        account = Web3.toChecksumAddress(verify_public_key_syntax(request.args.get('account')))[2:]
+    except (ValueError, TypeError):
+        return jsonify({
+            "result": "Missing or invalid account"
+        })
+    return get_events(account=account)
+
+@app.route("/api/campaign/verification", methods=["GET"])
+def get_verification():
+    try:
+        fundAddress = verify_public_key_syntax(request.args.get('address'))[2:]
+    except (ValueError, TypeError):
+        return jsonify({
+            "result": "Missing or invalid Fund Address"
+        })
+    return jsonify(db.get_verifications(fundAddress))
+
+if __name__ == '__main__':
+    app.run(host='0.0.0.0', port=80, debug=False)
+
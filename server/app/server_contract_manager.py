@@ -1,47 +1,135 @@
-from datetime import datetime, timedelta
-from web3 import Web3
-from web3.middleware import geth_poa_middleware
-from solc import compile_standard
-import json, os
-
-
-w3 = Web3(Web3.HTTPProvider(os.environ.get("ETH_HOST")))
-w3.middleware_onion.inject(geth_poa_middleware, layer=0)
-
-MIN_CONTRACT_TIME = 1 # in days
-MAX_CONTRACT_TIME = 36500 # in days
-
-
-class ServerContractManager:
-    def __init__(self) -> None:
-        comp = {
-            "language": "Solidity",
-            "sources": {
-                "fundraiser.sol": {
-                    "content":
-                        open("app/contracts/fundraiser.sol", "r").read()
-                },
-            },
-            "settings": {
-                "outputSelection": { "*": { "*": [ "*" ], "": [ "*" ] } }
-            }
-        }
-        compiled_sol = compile_standard(comp)
-        self.bytecode = compiled_sol['contracts']['fundraiser.sol']['Fundraiser']['evm']['bytecode']['object']
-        self.abi = json.loads(compiled_sol['contracts']['fundraiser.sol']['Fundraiser']['metadata'])['output']['abi']
-
-
-    def get_fund_status(self, contract_address):
-        Fundraiser = w3.eth.contract(
-            address=contract_address,
-            abi=self.abi
-        )
-        bal, funds_withdrawn, expires, goal = Fundraiser.functions.getStatus().call()
-        return {
-            "balance": bal,
-            "expires": datetime.fromtimestamp(expires),
-            "expired": datetime.now() > datetime.fromtimestamp(expires),
-            "goal_reached": funds_withdrawn or goal < bal, 
-            "goal": goal,
-            "funds_withdrawn": funds_withdrawn
-        }
+from datetime import datetime, timedelta
+from web3 import Web3
+from web3.middleware import geth_poa_middleware
+from contract_artifacts import ContractArtifact
+import os
+from rpc_batch import batch_request
+
+
+w3 = Web3(Web3.HTTPProvider(os.environ.get("ETH_HOST")))
+w3.middleware_onion.inject(geth_poa_middleware, layer=0)
+
+MIN_CONTRACT_TIME = 1 # in days
+MAX_CONTRACT_TIME = 36500 # in days
+
+# runtime code of an EIP-1167 minimal proxy (a fund created by the fundraiser factory)
+# is CLONE_PREFIX + implementation address + CLONE_SUFFIX
+CLONE_PREFIX = "363d3d373d3d3d363d73"
+CLONE_SUFFIX = "5af43d82803e903d91602b57fd5bf3"
+# implementations that clones are accepted of, comma separated. Empty accepts clones of any implementation
+FUNDRAISER_IMPLEMENTATIONS = set(i.strip().lower().replace("0x", "") for i in os.environ.get("FUNDRAISER_IMPLEMENTATIONS", "").split(",") if i.strip() != "")
+
+# events of the fundraiser contract, topic -> event name
+EVENT_TOPICS = {
+    Web3.keccak(text="Funded(address,uint256)").hex(): "Funded",
+    Web3.keccak(text="Refunded(address,uint256)").hex(): "Refunded",
+    Web3.keccak(text="Withdrawn(address,uint256)").hex(): "Withdrawn"
+}
+
+
+class ServerContractManager:
+    def __init__(self) -> None:
+        # abi and bytecode are loaded lazily from the compiled artifact store
+        self.artifact = ContractArtifact("app/contracts/fundraiser.sol", "Fundraiser")
+
+    @property
+    def abi(self):
+        return self.artifact.abi
+
+    @property
+    def bytecode(self):
+        return self.artifact.bytecode
+
+
+    def get_fund_status(self, contract_address):
+        Fundraiser = w3.eth.contract(
+            address=contract_address,
+            abi=self.abi
+        )
+        bal, funds_withdrawn, expires, goal = Fundraiser.functions.getStatus().call()
+        return self._format_status(bal, funds_withdrawn, expires, goal)
+
+    def _format_status(self, bal, funds_withdrawn, expires, goal):
+        return {
+            "balance": bal,
+            "expires": datetime.fromtimestamp(expires),
+            "expired": datetime.now() > datetime.fromtimestamp(expires),
+            "goal_reached": funds_withdrawn or goal < bal, 
+            "goal": goal,
+            "funds_withdrawn": funds_withdrawn
+        }
+
+    def block_number(self):
+        return w3.eth.block_number
+
+    def get_fund_statuses(self, addresses, block=None):
+        # getStatus of many funds in a few batched eth_calls, all read at the same block.
+        # Returns a dict of address -> status, None for addresses that aren't live funds
+        if block is None:
+            block = w3.eth.block_number
+        data = w3.eth.contract(abi=self.abi).encodeABI(fn_name="getStatus")
+        results = batch_request([("eth_call", [{"to": address, "data": data}, hex(block)]) for address in addresses])
+        statuses = dict()
+        for address, result in zip(addresses, results):
+            if isinstance(result, Exception) or result in (None, "0x"):
+                statuses[address] = None
+                continue
+            bal, funds_withdrawn, expires, goal = w3.codec.decode_abi(["uint256", "bool", "uint256", "uint256"], Web3.toBytes(hexstr=result))
+            statuses[address] = self._format_status(bal, funds_withdrawn, expires, goal)
+        return statuses
+
+    def get_fund_events(self, from_block, to_block):
+        # Funded, Refunded and Withdrawn events of all funds in the block range, as
+        # (tx_hash, log_index, block, fund address, event, account, amount) tuples with
+        # lower case addresses
+        logs = w3.eth.get_logs({
+            "fromBlock": from_block,
+            "toBlock": to_block,
+            "topics": [list(EVENT_TOPICS.keys())]
+        })
+        events = []
+        for log in logs:
+            if len(log["topics"]) != 2 or log.get("removed"):
+                continue # same signature from a contract that isn't a fundraiser
+            events.append((
+                log["transactionHash"].hex(),
+                log["logIndex"],
+                log["blockNumber"],
+                log["address"][2:].lower(),
+                EVENT_TOPICS[log["topics"][0].hex()],
+                Web3.toHex(log["topics"][1][-20:])[2:],
+                Web3.toInt(hexstr=log["data"])
+            ))
+        return events
+
+    def get_block_times(self, blocks):
+        # block number -> datetime of the block, in a single batch of calls
+        blocks = list(blocks)
+        results = batch_request([("eth_getBlockByNumber", [hex(i), False]) for i in blocks])
+        return {block: datetime.fromtimestamp(int(result["timestamp"], 16)) for block, result in zip(blocks, results) if isinstance(result, dict)}
+
+    def clone_implementation(self, code):
+        # implementation address of minimal proxy runtime code, None for any other code
+        code = code[2:] if code.startswith("0x") else code
+        if len(code) == 90 and code.startswith(CLONE_PREFIX) and code.endswith(CLONE_SUFFIX):
+            return Web3.toChecksumAddress(code[len(CLONE_PREFIX):-len(CLONE_SUFFIX)])
+        return None
+
+    def is_accepted_implementation(self, implementation):
+        return len(FUNDRAISER_IMPLEMENTATIONS) == 0 or implementation[2:].lower() in FUNDRAISER_IMPLEMENTATIONS
+
+    def get_fund_implementations(self, addresses, block=None):
+        # Reads the code of many funds in one batch. Returns a dict of address ->
+        # implementation address for clones, None for full contracts and missing code
+        if block is None:
+            block = w3.eth.block_number
+        results = batch_request([("eth_getCode", [address, hex(block)]) for address in addresses])
+        return {address: self.clone_implementation(result) if isinstance(result, str) else None for address, result in zip(addresses, results)}
+
+    def get_destroyed_funds(self, addresses, block=None):
+        # Reads the code of many funds in one batch. Returns the set of addresses that
+        # have no code, addresses whose code couldn't be read aren't in it
+        if block is None:
+            block = w3.eth.block_number
+        results = batch_request([("eth_getCode", [address, hex(block)]) for address in addresses])
+        return {address for address, result in zip(addresses, results) if result == "0x"}
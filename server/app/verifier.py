@@ -0,0 +1,84 @@
+import os
+import threading
+
+VERIFY_WORKERS = int(os.environ.get("VERIFY_WORKERS", 2))
+VERIFY_BATCH_SIZE = int(os.environ.get("VERIFY_BATCH_SIZE", 200))
+VERIFY_RETRY = float(os.environ.get("VERIFY_RETRY", 5)) # in seconds between checks of a pending verification
+VERIFY_TIMEOUT = float(os.environ.get("VERIFY_TIMEOUT", 120)) # in seconds until a pending verification is rejected
+# clients register new funds before their transaction is mined, so a new fund gets
+# a longer grace period to show up on the blockchain
+VERIFY_CREATE_TIMEOUT = float(os.environ.get("VERIFY_CREATE_TIMEOUT", 900)) # in seconds
+VERIFY_IDLE = float(os.environ.get("VERIFY_IDLE", 1)) # in seconds
+
+
+# Background workers that check registered and ended campaigns against the blockchain.
+# The create and end endpoints only queue a verification, the workers take due
+# verifications in batches, read all their contracts with one batch of getStatus
+# calls and write all the results in one transaction. The blockchain node of the
+# server can be a few blocks behind the client, so a verification that doesn't
+# match the chain yet is retried until VERIFY_TIMEOUT before it's rejected.
+class Verifier:
+    def __init__(self, db, contract_manager, workers=VERIFY_WORKERS) -> None:
+        self.db = db
+        self.contract_manager = contract_manager
+        self.workers = workers
+        self.wake = threading.Event()
+
+    def start(self):
+        for _ in range(self.workers):
+            threading.Thread(target=self.run, daemon=True).start()
+
+    def notify(self):
+        # called when a verification is queued so it's checked right away
+        self.wake.set()
+
+    def run(self):
+        while True:
+            try:
+                if self.verify_batch() > 0:
+                    continue
+            except Exception as e:
+                print("Verifier failed: {}".format(str(e)), flush=True)
+            self.wake.wait(VERIFY_IDLE)
+            self.wake.clear()
+
+    def verify_batch(self):
+        # returns the number of verifications taken
+        batch = self.db.claim_verifications(VERIFY_BATCH_SIZE, VERIFY_RETRY)
+        if len(batch) == 0:
+            return 0
+        block = self.contract_manager.block_number()
+        statuses = self.contract_manager.get_fund_statuses(list(set('0x' + i["address"] for i in batch)), block)
+        # funds created by a factory are clones, their implementation is checked too
+        implementations = self.contract_manager.get_fund_implementations(
+            list(set('0x' + i["address"] for i in batch if i["kind"] == "create" and statuses.get('0x' + i["address"]) is not None)), block
+        )
+        # a failed getStatus doesn't mean the fund is gone, only missing code does
+        destroyed = self.contract_manager.get_destroyed_funds(
+            list(set('0x' + i["address"] for i in batch if i["kind"] != "create" and statuses.get('0x' + i["address"]) is None)), block
+        )
+        created, ended, rejected_creates, results = [], [], [], []
+        for item in batch:
+            status = statuses.get('0x' + item["address"])
+            timed_out = item["age"] > (VERIFY_CREATE_TIMEOUT if item["kind"] == "create" else VERIFY_TIMEOUT)
+            if item["kind"] == "create":
+                implementation = implementations.get('0x' + item["address"])
+                if status is not None and implementation is not None and not self.contract_manager.is_accepted_implementation(implementation):
+                    rejected_creates.append(item["address"])
+                    results.append((item["id"], "rejected", "Clone of an unknown fundraiser implementation"))
+                elif status is not None:
+                    created.append((item["address"], status["goal"], status["expires"], implementation[2:] if implementation is not None else None))
+                    results.append((item["id"], "verified", None))
+                elif timed_out:
+                    rejected_creates.append(item["address"])
+                    results.append((item["id"], "rejected", "No fundraiser contract at address"))
+            else:
+                # a fund ends when withdraw destroys its contract
+                if '0x' + item["address"] in destroyed:
+                    # verified by complete_verifications if the campaign is found
+                    ended.append((item["id"], item["address"], item["dest_account"], item["final"]))
+                elif status is not None and timed_out:
+                    results.append((item["id"], "rejected", "Contract is still active"))
+        self.db.complete_verifications(created, ended, rejected_creates, results)
+        print("Verified {} of {} campaign changes".format(len(results) + len(ended), len(batch)), flush=True)
+        return len(batch)